@@ -2,6 +2,9 @@ import json
 from pathlib import Path
 from typing import Dict
 
+# Chiavi di percorso modificabili dall'utente
+_PATH_KEYS = frozenset({'tinydb_file', 'library_path', 'upload_dir_path', 'exiftool_path'})
+
 class ConfigManager:
     def __init__(self, config_path: str):
         self.config_path = Path(config_path)
@@ -36,7 +39,7 @@ class ConfigManager:
             key: Uno dei valori tra 'tinydb_file', 'library_path', 'upload_dir_path', 'exiftool_path'
             new_path: Il nuovo percorso da impostare
         """
-        if key not in ['tinydb_file', 'library_path', 'upload_dir_path', 'exiftool_path']:
+        if key not in _PATH_KEYS:
             raise ValueError(f"Chiave di percorso non valida: {key}")
         
         self.config['paths'][key] = str(new_path)
@@ -44,14 +47,18 @@ class ConfigManager:
 
     def update_paths(self, new_paths: Dict[str, str]):
         """
-        Aggiorna più percorsi contemporaneamente e salva le modifiche
+        Aggiorna più percorsi contemporaneamente e salva le modifiche con un'unica scrittura
+        (nessuna scrittura se i valori sono invariati)
         
         Args:
             new_paths: Dizionario con le nuove impostazioni dei percorsi
                      Esempio: {'tinydb_file': 'path.json', 'library_path': 'new/library/path'}
         """
-        for key, path in new_paths.items():
-            if key in ['tinydb_file', 'library_path', 'upload_dir_path', 'exiftool_path']:
-                self.config['paths'][key] = str(path)
-        
+        paths = self.config.setdefault('paths', {})
+        changes = {key: str(path) for key, path in new_paths.items()
+                   if key in _PATH_KEYS and paths.get(key) != str(path)}
+        if not changes:
+            return
+
+        paths.update(changes)
         self._save_config()
@@ -3,17 +3,30 @@ import platform
 import subprocess
 from pathlib import Path
 
+# Il sistema operativo non cambia durante l'esecuzione: l'apertura file viene scelta una volta sola
+if platform.system() == "Windows":
+    def _open_with_default_app(file_path: str) -> None:
+        os.startfile(file_path)
+else:
+    # macOS usa "open", Linux e altri "xdg-open"
+    _OPENER = "open" if platform.system() == "Darwin" else "xdg-open"
+
+    def _open_with_default_app(file_path: str) -> None:
+        # Avvio senza attendere la fine del processo: l'interfaccia non resta bloccata
+        subprocess.Popen(
+            [_OPENER, file_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+
 class FileSystemHandler:
     @staticmethod
     def open_file_with_default_app(file_path: str) -> bool:
         """Apre il file con l'applicazione predefinita del sistema"""
         try:
-            if platform.system() == "Windows":
-                os.startfile(file_path)
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(["open", file_path], check=True)
-            else:  # Linux e altri
-                subprocess.run(["xdg-open", file_path], check=True)
+            _open_with_default_app(file_path)
             return True
         except Exception as e:
             raise RuntimeError(f"Impossibile aprire il file: {str(e)}")
@@ -1,5 +1,14 @@
 import re
 import platform
+from functools import lru_cache
+
+# Espressioni precompilate: la piattaforma non cambia durante l'esecuzione
+if platform.system() == "Windows":
+    _INVALID_FS_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1F]')
+else:
+    _INVALID_FS_CHARS = re.compile(r'[\x00-\x1F/]')
+_NON_WORD_CHARS = re.compile(r'[^\w\s-]')
+_MULTIPLE_SPACES = re.compile(r'\s+')
 
 class FormValidators:
     @staticmethod
@@ -9,30 +18,26 @@ class FormValidators:
             return False, "Il nome dell'autore non può essere vuoto"
             
         fs_name = FormValidators.author_to_fsname(author_name)
-        
-        if platform.system() == "Windows":
-            invalid_chars = r'[<>:"/\\|?*\x00-\x1F]'
-        else:
-            invalid_chars = r'[\x00-\x1F/]'
             
-        if re.search(invalid_chars, fs_name):
+        if _INVALID_FS_CHARS.search(fs_name):
             return False, f"Il nome contiene caratteri non validi: {fs_name}"
             
         return True, fs_name
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def author_to_fsname(author_name: str) -> str:
-        """Converte il nome dell'autore in una versione filesystem-safe"""
+        """Converte il nome dell'autore in una versione filesystem-safe (memoizzata)"""
         normalized = author_name.replace("'", " ")
-        normalized = re.sub(r'[^\w\s-]', '', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized = _NON_WORD_CHARS.sub('', normalized)
+        normalized = _MULTIPLE_SPACES.sub(' ', normalized)
         return normalized.strip()
 
     @staticmethod
     def title_to_fsname(title: str) -> str:
         """Converte il titolo in una versione filesystem-safe"""
         # Rimuove caratteri speciali e normalizza
-        normalized = re.sub(r'[^\w\s-]', '', title)
+        normalized = _NON_WORD_CHARS.sub('', title)
         # Sostituisci spazi multipli con singolo spazio
-        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized = _MULTIPLE_SPACES.sub(' ', normalized)
         return normalized.strip()
\ No newline at end of file
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Union
 
 from formvalidators import FormValidators
 from filesystem import FileSystemHandler
+from tools.storage import OrjsonStorage
 
 @dataclass
 class Book:
@@ -26,13 +27,15 @@ class Book:
         # Parsing del campo 'added'
         added_str = data['added']
         try:
-            if '+' in added_str or added_str.endswith('Z'):
+            try:
+                # Percorso veloce: fromisoformat (in C) copre sia le date con timezone che quelle senza
                 added = datetime.fromisoformat(added_str)
-            else:
+            except ValueError:
                 try:
                     added = datetime.strptime(added_str.split('.')[0], "%Y-%m-%dT%H:%M:%S")
                 except ValueError:
                     added = datetime.strptime(added_str.split('.')[0], "%Y-%m-%dT%H:%M")
+            if added.tzinfo is None:
                 added = added.replace(tzinfo=datetime.now().astimezone().tzinfo)
         except ValueError as e:
             added = datetime.now().astimezone()
@@ -116,10 +119,11 @@ class Book:
 ######################################################################################################
 class TagsManager:
     def __init__(self, library_root_path: str, db_file_name: str):
-        self.db = tinydb.TinyDB(f"{library_root_path}/{db_file_name}")
+        self.db = tinydb.TinyDB(f"{library_root_path}/{db_file_name}", storage=OrjsonStorage)
         self.tags_table = self.db.table('tags')
         self._cache = None
         self._dirty = True
+        self.version = 0 # Cresce ad ogni modifica dei tag: chi tiene dati derivati sa quando rifarli
 
     def _ensure_cache(self):
         """Carica la cache se è obsoleta o non esiste"""
@@ -144,17 +148,20 @@ class TagsManager:
         """Aggiunge un nuovo tag"""
         tag_id = self.tags_table.insert({'name': name, 'icon': icon})
         self._dirty = True
+        self.version += 1
         return tag_id
 
     def update_tag(self, tag_id: int, new_data: Dict[str, Any]):
         """Aggiorna un tag esistente"""
         self.tags_table.update(new_data, doc_ids=[tag_id])
         self._dirty = True
+        self.version += 1
 
     def remove_tag(self, tag_id: int):
         """Rimuove un tag"""
         self.tags_table.remove(doc_ids=[tag_id])
         self._dirty = True
+        self.version += 1
 
     def close(self):
         """Chiude la connessione al database"""
@@ -168,9 +175,11 @@ class TagsManager:
 #####################################################################################################
 class BookManager:
     def __init__(self, library_root_path: str, db_file_name: str, tags_manager: TagsManager = None):
-        self.db = tinydb.TinyDB(f"{library_root_path}/{db_file_name}")
+        self.db = tinydb.TinyDB(f"{library_root_path}/{db_file_name}", storage=OrjsonStorage)
         self.books_table = self.db.table('books')
         self._cache = None
+        self._search_index = None
+        self._sorted_cache: Dict[tuple, List[Book]] = {}
         self._dirty = True
         self._library_root = library_root_path
         self.tags_manager = tags_manager
@@ -182,10 +191,23 @@ class BookManager:
     def _ensure_cache(self):
         """Carica la cache se è obsoleta o non esiste"""
         if self._dirty or self._cache is None:
+            # Righe grezze dallo storage: niente Document intermedi per ogni libro
+            raw_books = (self.db.storage.read() or {}).get(self.books_table.name, {})
             self._cache = {book['uuid']: Book.from_dict(book) 
-                          for book in self.books_table.all()}
+                          for book in raw_books.values()}
+            self._search_index = None
+            self._sorted_cache.clear()
             self._dirty = False
 
+    def _ensure_search_index(self):
+        """Titolo e autore normalizzati (casefold) una sola volta per ogni caricamento della cache"""
+        self._ensure_cache()
+        if self._search_index is None:
+            self._search_index = [
+                (book, (book.title or '').casefold(), (book.author or '').casefold())
+                for book in self._cache.values()
+            ]
+
     def add_book(self, book: Book):
         # Validazione nome autore
         is_valid, fs_name = FormValidators.validate_author_name(book.author)
@@ -265,37 +287,46 @@ class BookManager:
         if not text:
             return self.get_all_books()
             
-        self._ensure_cache()
-        text_lower = text.lower()
+        self._ensure_search_index()
+        text_folded = text.casefold()
         
+        # Ricerca per sottostringa semplice (nessuna regex) su testo già normalizzato
         return [
-            book for book in self._cache.values()
-            if (book.title and text_lower in book.title.lower()) or
-               (book.author and text_lower in book.author.lower())
+            book for book, title_folded, author_folded in self._search_index
+            if text_folded in title_folded or text_folded in author_folded
         ]
 
 ################### SORT BOOKS ###########################
     def sort_books(self, field: str, reverse: bool = None) -> List[Book]:
+        # Se reverse è None, usa un valore predefinito in base al campo
+        if reverse is None:
+            reverse = False if field != 'added' else True
+
+        # L'ordinamento dipende solo da (campo, verso) finché la cache non viene ricaricata
+        self._ensure_cache()
+        cached = self._sorted_cache.get((field, reverse))
+        if cached is not None:
+            return list(cached)
+
         books = self.get_all_books()
 
         if not books:
             return []
 
-        # Se reverse è None, usa un valore predefinito in base al campo
-        if reverse is None:
-            reverse = False if field != 'added' else True
-
         if field == 'added':
             books.sort(key=lambda x: x.added, reverse=reverse)
         elif hasattr(books[0], field):
             books.sort(key=lambda x: str(getattr(x, field) or ''), reverse=reverse)
 
-        return books
+        self._sorted_cache[(field, reverse)] = books
+        return list(books)
 
     def close(self):
         """Chiude la connessione al database e pulisce la cache"""
         self.db.close()
         self._cache = None
+        self._search_index = None
+        self._sorted_cache.clear()
         self._dirty = True
 
 ######################################################################
@@ -60,14 +60,14 @@ class AddScreen(Screen):
     def handle_file_selected(self, event: DirectoryTree.FileSelected) -> None:
         event.stop()
 
-        if self.form.selected_file_label: # Check if the label exists in the form
-            try:
-                # Update the label *within the form*
-                self.form.selected_file_label.update(str(event.path))
-            except Exception as e:
-                self.notify(f"Errore selezione file: {e}", severity="error")
-                if self.form.selected_file_label:
-                    self.form.selected_file_label.update("Errore nella selezione")
+        try:
+            # Memorizza il percorso nel form (aggiorna anche l'etichetta)
+            self.form.select_file(event.path)
+        except Exception as e:
+            self.notify(f"Errore selezione file: {e}", severity="error")
+            self.form.select_file(None)
+            if self.form.selected_file_label:
+                self.form.selected_file_label.update("Errore nella selezione")
 
     @on(Button.Pressed, "#save")
     def on_button_pressed(self, event: Button.Pressed):
@@ -29,7 +29,7 @@ class EditScreen(Screen):
         yield Header()
         yield Vertical(
             Label(f"Modifica: {self.book.title}", id="edit-title-label", classes="title"),
-            self.form.form_container,
+            self.form.compose_form(),
             Horizontal(
                 Label("Letto?", classes="form-label"),
                 self.read_checkbox,
@@ -75,6 +75,8 @@ class EditScreen(Screen):
                 values = self.form.get_values()
                 if not self.read_checkbox.value:
                     values['read'] = None
+                # Il file non si modifica da qui: conserva il nome salvato nel DB
+                values['filename'] = self.book.filename
                 self.logger.info(f"Modifica libro: {self.book.uuid}")
                 self.bookmanager.update_book(self.book.uuid, values)
                 self.app.pop_screen()
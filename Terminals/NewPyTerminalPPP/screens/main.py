@@ -37,9 +37,9 @@ class MainScreen(Screen):
         self.main_upload_dir = config_manager.paths["upload_dir_path"]
         self.logger = AppLogger.get_logger()
 
-        # Inizializza il formattatore di tag
-        # tags_data = library_manager.tags.get_all_tags()
-        # self.tag_formatter = TagFormatter(tags_data)
+        # Formattatore dei tag creato al primo aggiornamento e riusato da ordinamenti e ricerche
+        self.tag_formatter: TagFormatter | None = None
+        self._tags_version = -1 # Versione dei tag usata dal formattatore
 
         self.sort_reverse = False
         self.sort_field = "added"
@@ -58,24 +58,20 @@ class MainScreen(Screen):
     def update_table(self):
         books = self.library_manager.books.sort_books('added')
 
-        # Prepara i tag formattati con le icone
-        formatted_tags = []
-        for book in books:
-            formatted = []
-            for tag_name in book.tags:
-                tag_info = next(
-                    (t for t in self.library_manager.tags.get_all_tags().values() 
-                    if t['name'] == tag_name),
-                    None
-                )
-                if tag_info:
-                    formatted.append(f"{tag_info['icon']} {tag_name}")
-                else:
-                    formatted.append(tag_name)
-            formatted_tags.append(", ".join(formatted))
-    
         table = self.query_one("#books-table", DataTableBook)
-        table.update_table(books, formatted_tags)
+        table.update_table(books, self._format_tags(books))
+
+    def _format_tags(self, books) -> list[str]:
+        """Prepara i tag formattati con le icone, leggendo i tag una sola volta"""
+        tags = self.library_manager.tags
+        if self.tag_formatter is None:
+            self.tag_formatter = TagFormatter(tags.get_all_tags())
+        elif self._tags_version != tags.version:
+            # I tag sono cambiati: le stringhe già formattate non valgono più
+            self.tag_formatter.invalidate_tag_cache(tags.get_all_tags())
+        self._tags_version = tags.version
+        format_tags = self.tag_formatter.format_tags
+        return [format_tags(book.tags) for book in books]
 
     def action_edit_book(self):
         table = self.query_one("#books-table", DataTableBook)
@@ -129,20 +125,10 @@ class MainScreen(Screen):
     def action_reverse_sort(self):
         table = self.query_one("#books-table", DataTableBook)
 
-        column_mapping = {
-            0: "added",
-            1: "author",
-            2: "title",
-            3: "read",
-            4: "tags"
-        }
-
-        # Ottieni la colonna corrente del cursore
-        current_col = table.current_column
-        
         # Se il cursore è su una colonna valida, usa quella per l'ordinamento
-        if current_col is not None and current_col in column_mapping:
-            self.sort_field = column_mapping[current_col]
+        current_field = table.field_for_column(table.current_column)
+        if current_field is not None:
+            self.sort_field = current_field
 
         # Inverti l'ordine
         self.sort_reverse = not self.sort_reverse
@@ -162,26 +148,10 @@ class MainScreen(Screen):
             if query:
                 # Esegui la ricerca usando il nuovo metodo
                 books = self.library_manager.books.search_books_by_text(query)
-                
-                # Formatta i tag
-                formatted_tags = []
-                for book in books:
-                    formatted = []
-                    for tag_name in book.tags:
-                        tag_info = next(
-                            (t for t in self.library_manager.tags.get_all_tags().values() 
-                            if t['name'] == tag_name),
-                            None
-                        )
-                        if tag_info:
-                            formatted.append(f"{tag_info['icon']} {tag_name}")
-                        else:
-                            formatted.append(tag_name)
-                    formatted_tags.append(", ".join(formatted))
 
                 # Aggiorna la tabella
                 table = self.query_one("#books-table", DataTableBook)
-                table.update_table(books, formatted_tags)
+                table.update_table(books, self._format_tags(books))
 
         self.app.push_screen(
             InputScreen(
@@ -18,10 +18,16 @@ class Settings(Screen):
     def compose(self) -> ComposeResult:
         yield Header()
 
-        yield Input(value=self._configpaths['db'], id="db-path", placeholder="Percorso database")
-        yield Input(value=self._configpaths['library'], id="library-path", placeholder="Percorso libreria")
-        yield Input(value=self._configpaths['main_upload_dir'], id="main-upload-dir", placeholder="Percorso upload")
-        yield Input(value=self._configpaths['exiftool_path'], id="exiftool-path", placeholder="Percorso ExIfTool")
+        # Riferimenti tenuti sull'istanza: il salvataggio non deve interrogare il DOM
+        self._db_input = Input(value=self._configpaths.get('tinydb_file', ''), id="db-path", placeholder="Percorso database")
+        self._library_input = Input(value=self._configpaths.get('library_path', ''), id="library-path", placeholder="Percorso libreria")
+        self._upload_input = Input(value=self._configpaths.get('upload_dir_path', ''), id="main-upload-dir", placeholder="Percorso upload")
+        self._exiftool_input = Input(value=self._configpaths.get('exiftool_path', ''), id="exiftool-path", placeholder="Percorso ExIfTool")
+
+        yield self._db_input
+        yield self._library_input
+        yield self._upload_input
+        yield self._exiftool_input
 
         yield Button("Salva", id="save-button")
 
@@ -29,16 +35,11 @@ class Settings(Screen):
 
     @on(Button.Pressed, "#save-button")
     def handle_save(self, event: Button.Pressed):
-        db_path = self.query_one("#db-path", Input).value
-        library_path = self.query_one("#library-path", Input).value
-        main_upload_dir = self.query_one("#main-upload-dir", Input).value
-        exiftool_path = self.query_one("#exiftool-path", Input).value
-
         self.config_manager.update_paths({
-            'db': db_path,
-            'library': library_path,
-            'main_upload_dir': main_upload_dir,
-            'exiftool_path': exiftool_path
+            'tinydb_file': self._db_input.value,
+            'library_path': self._library_input.value,
+            'upload_dir_path': self._upload_input.value,
+            'exiftool_path': self._exiftool_input.value
         })
 
         self.notify("Percorsi aggiornati con successo!")
@@ -3,21 +3,33 @@ from typing import Dict, List, Optional
 class TagFormatter:
     def __init__(self, tags_data: Optional[Dict[int, Dict[str, str]]] = None):
         self.tags_data = tags_data or {}
+        # Cache nome tag -> "icona nome", riempita alla prima richiesta di ogni tag
+        self._formatted: Dict[str, str] = {}
+        self._icons: Optional[Dict[str, str]] = None
+
+    def invalidate_tag_cache(self, tags_data: Optional[Dict[int, Dict[str, str]]] = None):
+        """Svuota la cache (ed eventualmente sostituisce i dati) quando i tag cambiano"""
+        if tags_data is not None:
+            self.tags_data = tags_data
+        self._formatted.clear()
+        self._icons = None
+
+    def _format_tag(self, tag_name: str) -> str:
+        """Formatta un singolo tag con la sua icona, usando la cache"""
+        formatted = self._formatted.get(tag_name)
+        if formatted is None:
+            if self._icons is None:
+                self._icons = {}
+                for t in self.tags_data.values():
+                    self._icons.setdefault(t['name'], t['icon'])
+            icon = self._icons.get(tag_name)
+            formatted = f"{icon} {tag_name}" if icon is not None else tag_name
+            self._formatted[tag_name] = formatted
+        return formatted
 
     def format_tags(self, tag_names: List[str]) -> str:
         """Formatta una lista di nomi di tag con le relative icone"""
         if not self.tags_data:
             return ", ".join(tag_names)
-            
-        formatted_tags = []
-        for tag_name in tag_names:
-            # Cerca il tag nei dati
-            tag_info = next(
-                (t for t in self.tags_data.values() if t['name'] == tag_name), 
-                None
-            )
-            if tag_info:
-                formatted_tags.append(f"{tag_info['icon']} {tag_name}")
-            else:
-                formatted_tags.append(tag_name)
-        return ", ".join(formatted_tags)
\ No newline at end of file
+
+        return ", ".join([self._format_tag(tag_name) for tag_name in tag_names])
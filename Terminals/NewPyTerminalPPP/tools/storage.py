@@ -0,0 +1,25 @@
+import os
+from typing import Any, Dict, Optional
+
+from tinydb.storages import JSONStorage
+
+try:
+    import orjson
+except ImportError: # orjson è opzionale: senza, si usa il json standard di TinyDB
+    orjson = None
+
+
+class OrjsonStorage(JSONStorage):
+    """JSONStorage di TinyDB che legge il file con orjson (2-4 volte più veloce sui file grandi)"""
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if orjson is None:
+            return super().read()
+
+        # Dimensione del file: se è vuoto TinyDB deve inizializzare il database
+        self._handle.seek(0, os.SEEK_END)
+        if not self._handle.tell():
+            return None
+
+        self._handle.seek(0)
+        return orjson.loads(self._handle.read())
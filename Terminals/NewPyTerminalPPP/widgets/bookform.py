@@ -1,49 +1,110 @@
+import re
+from calendar import monthrange
 from pathlib import Path
 from typing import Optional
 from textual.app import ComposeResult
 from textual.widgets import Input, Button, TextArea, DirectoryTree, Label
 from textual.containers import Vertical, Horizontal, VerticalScroll
-from datetime import datetime
+
+# Forma esatta di una data "YYYY-MM-DD HH:MM": i gruppi vengono controllati a intervalli, senza strptime
+_READ_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2})$")
 
 
 class BookForm:
+    # Estensioni ammesse nel file browser, condivise da tutte le istanze
+    _VALID_EXTS = frozenset({".pdf", ".epub", ".docx"})
+
+    __slots__ = (
+        "_initial_values", "book_data",
+        "title_input", "author_input", "tags_input", "series_input",
+        "num_series_input", "read_input", "description_input", "save_button",
+        "file_tree", "selected_file_label", "_selected_path",
+        "show_file_browser", "_start_directory", "form_container",
+        "_tags_cache_src", "_tags_cache",
+    )
+
     def __init__(self, book=None, start_directory: str = ".", show_file_browser: bool = True):
-        self.title_input = Input(placeholder="Titolo", value=book.title if book else "", classes="form-input")
-        self.author_input = Input(placeholder="Autore", value=book.author if book else "", classes="form-input")
-        self.tags_input = Input(placeholder="Tags (separati da virgola)", value=", ".join(book.tags) if book else "", classes="form-input")
-        self.series_input = Input(placeholder="Serie", value=book.series if book and book.series else "", classes="form-input")
-        self.num_series_input = Input(placeholder="Numero serie", value=str(book.num_series) if book and book.num_series else "", classes="form-input")
-        self.read_input = Input(placeholder="Data lettura (YYYY-MM-DD)", value=book.read if book and book.read else "", classes="form-input")
-        self.description_input = TextArea(book.description if book and book.description else "", language="markdown", classes="form-input")
-        self.save_button = Button("Salva", id="save", variant="primary", classes="button-primary")
+        # Valori iniziali grezzi: i widget vengono creati solo alla composizione del form
+        if book is None:
+            self._initial_values = dict.fromkeys(
+                ('title', 'author', 'tags', 'series', 'num_series', 'read', 'description'), "")
+        else:
+            num_series = book.num_series
+            self._initial_values = {
+                'title': book.title,
+                'author': book.author,
+                'tags': ", ".join(book.tags),
+                'series': book.series or "",
+                'num_series': str(num_series) if num_series else "",
+                'read': book.read or "",
+                'description': book.description or "",
+            }
+        self.book_data = book
+
+        self.title_input: Optional[Input] = None
+        self.author_input: Optional[Input] = None
+        self.tags_input: Optional[Input] = None
+        self.series_input: Optional[Input] = None
+        self.num_series_input: Optional[Input] = None
+        self.read_input: Optional[Input] = None
+        self.description_input: Optional[TextArea] = None
+        self.save_button: Optional[Button] = None
 
         # Conditionally create file browser widgets
+        # Il DirectoryTree viene creato solo quando il form viene composto
         self.file_tree: Optional[DirectoryTree] = None
         self.selected_file_label: Optional[Label] = None
+        self._selected_path: Optional[Path] = None
 
         self.show_file_browser = show_file_browser
+        self._start_directory = start_directory
+
+        self.form_container: Optional[VerticalScroll] = None
+
+        # Ultimo testo dei tag analizzato e relativo risultato
+        self._tags_cache_src: Optional[str] = None
+        self._tags_cache: tuple[str, ...] = ()
+
+    def _create_widgets(self) -> None:
+        """Crea in un solo passaggio i widget del form a partire dai valori iniziali"""
+        values = self._initial_values
+        self.title_input = Input(placeholder="Titolo", value=values['title'], classes="form-input")
+        self.author_input = Input(placeholder="Autore", value=values['author'], classes="form-input")
+        self.tags_input = Input(placeholder="Tags (separati da virgola)", value=values['tags'], classes="form-input")
+        self.series_input = Input(placeholder="Serie", value=values['series'], classes="form-input")
+        self.num_series_input = Input(placeholder="Numero serie", value=values['num_series'], classes="form-input")
+        self.read_input = Input(placeholder="Data lettura (YYYY-MM-DD)", value=values['read'], classes="form-input")
+        self.description_input = TextArea(values['description'], language="markdown", classes="form-input")
+        self.save_button = Button("Salva", id="save", variant="primary", classes="button-primary")
 
         if self.show_file_browser:
-            self.file_tree = DirectoryTree(f"{start_directory}", id="file-browser")
-            self.file_tree.show_hidden = False
-            self.file_tree.filter_dirs = True
-            self.file_tree.valid_extensions = {".pdf", ".epub", ".docx", }
             self.selected_file_label = Label("Nessun file selezionato", id="selected-file")
 
-            if book and book.filename:
-                 # You might want to show the current filename or path here
-                 # For simplicity, we keep "Nessun file selezionato" until user clicks
-                 pass
+    def select_file(self, path: Optional[Path]) -> None:
+        """Memorizza il file scelto; l'etichetta serve solo per la visualizzazione"""
+        self._selected_path = path
+        if self.selected_file_label:
+            self.selected_file_label.update(str(path) if path else "Nessun file selezionato")
 
+    def _mount_file_tree(self) -> DirectoryTree:
+        """Crea il DirectoryTree alla prima composizione del form"""
+        if self.file_tree is None:
+            self.file_tree = DirectoryTree(f"{self._start_directory}", id="file-browser")
+            self.file_tree.show_hidden = False
+            self.file_tree.filter_dirs = True
+            self.file_tree.valid_extensions = BookForm._VALID_EXTS
+        return self.file_tree
+
+    def _build_layout(self) -> VerticalScroll:
         # --- Dynamic layout creation ---
         form_elements = []
 
         # Add file browser only if enabled
-        if self.show_file_browser and self.file_tree and self.selected_file_label:
+        if self.show_file_browser and self.selected_file_label:
             form_elements.extend([
                 Label("Seleziona file:", classes="form-label-heading"),
                 Horizontal(
-                    self.file_tree,
+                    self._mount_file_tree(),
                 ),
                 self.selected_file_label,
             ])
@@ -64,21 +125,32 @@ class BookForm:
             )
         ])
 
-        self.form_container = VerticalScroll(
+        return VerticalScroll(
             Vertical(*form_elements, id="form-content"),
             id="form-container"
         )
         # --- End Dynamic layout ---
 
     def compose_form(self) -> ComposeResult:
+        if self.form_container is None:
+            self._create_widgets()
+            self.form_container = self._build_layout()
         return self.form_container
 
+    def _parse_tags(self) -> tuple[str, ...]:
+        """Divide i tag separati da virgola, rianalizzando il testo solo se è cambiato"""
+        raw_tags = self.tags_input.value
+        if raw_tags != self._tags_cache_src:
+            self._tags_cache = tuple(tag for tag in map(str.strip, raw_tags.split(",")) if tag)
+            self._tags_cache_src = raw_tags
+        return self._tags_cache
+
     def get_values(self):
         filename_path = None
 
         try:
-            if self.show_file_browser and self.selected_file_label and self.selected_file_label.renderable != "Nessun file selezionato":
-                filename_path = Path(str(self.selected_file_label.renderable))
+            if self.show_file_browser:
+                filename_path = self._selected_path
             elif not self.show_file_browser and self.book_data:
                 filename_path = Path(self.book_data.filename) if self.book_data.filename else None
         except Exception:
@@ -98,7 +170,7 @@ class BookForm:
         return {
             'title': self.title_input.value,
             'author': self.author_input.value,
-            'tags': [tag.strip() for tag in self.tags_input.value.split(",") if tag.strip()],
+            'tags': list(self._parse_tags()),
             'series': self.series_input.value if self.series_input.value else None,
             'num_series': num_series_value,
             'read': read_value,
@@ -120,15 +192,19 @@ class BookForm:
                  return "Numero serie deve essere un numero valido (es. 1 o 2.5)"
 
         # Validate read date format if present - USE THE CORRECT FORMAT
-        if self.read_input.value.strip():
-            try:
-                datetime.strptime(self.read_input.value.strip(), "%Y-%m-%d %H:%M") # Check YYYY-MM-DD HH:MM format
-            except ValueError:
+        read_value = self.read_input.value.strip()
+        if read_value:
+            match = _READ_DATE_RE.match(read_value) # Check YYYY-MM-DD HH:MM format
+            if not match:
+                return "Formato data lettura non valido (usare YYYY-MM-DD HH:MM)"
+            year, month, day, hour, minute = map(int, match.groups())
+            if not (year and 1 <= month <= 12 and hour <= 23 and minute <= 59
+                    and 1 <= day <= monthrange(year, month)[1]):
                 return "Formato data lettura non valido (usare YYYY-MM-DD HH:MM)"
 
         # Validate file selection only if the browser is shown
         if self.show_file_browser:
-             if not self.selected_file_label or self.selected_file_label.renderable == "Nessun file selezionato":
+             if self._selected_path is None:
                  # Is a file mandatory for adding? If so:
                  # return "È obbligatorio selezionare un file"
                  pass # If file is optional, do nothing
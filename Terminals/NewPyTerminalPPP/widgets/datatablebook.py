@@ -1,6 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from textual.widgets import DataTable
 
+# Campo di ordinamento per ogni colonna, nello stesso ordine di on_mount
+_COL_FIELDS = ("added", "author", "title", "read", "tags")
+
 
 class DataTableBook(DataTable):
     def on_mount(self):
@@ -12,11 +15,16 @@ class DataTableBook(DataTable):
         self.cursor_type = "row"
         self._current_uuid = 0
         self._last_clicked_column = "added"
+        # Celle attualmente mostrate, per uuid: permettono di riconoscere un semplice riordino
+        self._row_cells: Dict[str, tuple] = {}
+        # Uuid nell'ordine in cui sono mostrati
+        self._row_order: List[str] = []
 
     def update_table(self, books, formatted_tags: Optional[List[str]] = None):
-        self.clear()
-
         if not books: # Handle empty book list
+             self.clear()
+             self._row_cells = {}
+             self._row_order = []
              return
 
         # Ensure formatted_tags list matches books list length if provided
@@ -25,40 +33,67 @@ class DataTableBook(DataTable):
              print("Warning: Mismatch between books and formatted_tags count. Falling back to raw tags.")
              formatted_tags = None # Reset to None
 
-        for i, b in enumerate(books):
-            read_date = "—"  # Valore predefinito
-            if b.read is not None and len(b.read) > 0:
-                read_date = "X"
+        # Date già formattate, per giorno: molti libri condividono la stessa data di aggiunta
+        date_cache = {}
 
-            added_date = b.added.strftime("%Y-%m-%d")
-            # tags_display = formatted_tags[i] if formatted_tags else ", ".join(b.tags)
-            tags_display = ", ".join(b.tags)
+        def format_added(added) -> str:
+            key = added.toordinal()
+            formatted = date_cache.get(key)
+            if formatted is None:
+                formatted = date_cache[key] = added.strftime("%Y-%m-%d")
+            return formatted
 
-            self.add_row(
-                added_date,
+        # Righe preparate prima, poi aggiunte con un solo aggiornamento a schermo
+        # (i tag formattati con le icone restano disattivati: si mostrano i tag grezzi)
+        rows = {
+            b.uuid: (
+                format_added(b.added),
                 b.author,
                 b.title,
-                read_date,
-                tags_display,
-                key=b.uuid
+                "X" if b.read else "—",
+                ", ".join(b.tags)
             )
+            for b in books
+        }
+
+        order = list(rows)
+        if rows == self._row_cells:
+            if order == self._row_order:
+                return # Stessi libri, stesso contenuto e stesso ordine: niente da fare
+            # Stessi libri con lo stesso contenuto: se ogni riga è distinguibile dalle sue celle
+            # (sort ordina per valori, non per chiave) le righe esistenti vengono solo riordinate
+            positions = {cells: index for index, cells in enumerate(rows.values())}
+            if len(positions) == len(rows):
+                self.sort(key=positions.__getitem__)
+                self._row_order = order
+                return
+
+        self.clear()
+        self._row_cells = rows
+        self._row_order = order
+
+        add_row = self.add_row
+        with self.app.batch_update():
+            for uuid, cells in rows.items():
+                add_row(*cells, key=uuid)
 
     def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
         if event.row_key.value is not None:
             self._current_uuid = event.row_key.value
 
-    def on_data_table_header_selected(self, event):
-        column_mapping = {
-            0: "added",
-            1: "author",
-            2: "title",
-            3: "read",
-            4: "tags"
-        }
+    @staticmethod
+    def field_for_column(column_index: Optional[int]) -> Optional[str]:
+        """Restituisce il campo di ordinamento di una colonna, o None se l'indice non è valido"""
+        if column_index is not None and 0 <= column_index < len(_COL_FIELDS):
+            return _COL_FIELDS[column_index]
+        return None
 
-        self.sort_field = column_mapping.get(event.column_index, "added")
+    def on_data_table_header_selected(self, event):
+        self.sort_field = self.field_for_column(event.column_index) or "added"
         self.sort_reverse = False
-        self.update_table()
+        # Riordina le righe già presenti invece di svuotare e ricaricare la tabella
+        self.sort(event.column_key, reverse=self.sort_reverse)
+        self._row_order = [row.key.value for row in self.ordered_rows]
 
     @property
     def current_column(self) -> Optional[int]:
@@ -6,7 +6,11 @@ import json
 import uuid
 import logging
 
+from collections import Counter
+from operator import itemgetter
+
 from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
 from pathlib import Path
 from pathvalidate import ValidationError, validate_filename
 
@@ -15,13 +19,17 @@ from textual import on
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Container
 from textual.logging import TextualHandler
+from textual.message import Message
 from textual.reactive import reactive
+from textual.timer import Timer
 from textual.widgets import DataTable, Button, Input, Tree, Footer
 from textual.widgets import TabbedContent, TabPane
 
 """ My modules """
 from tool.config_reader import ConfigReader
 from tool.formatted_date_time import FormattedDateTime
+from tool.orjson_storage import OrjsonStorage
+from tool.exiftool import ExifToolProcess
 """ My widgets """
 from widgets.add_new_book import AddNewBook
 from widgets.book_details import BookDetails
@@ -39,7 +47,93 @@ logging.basicConfig(
     force=True
 )
 
+# Righe inserite subito nella tabella (più di quelle visibili): le altre arrivano dopo il primo refresh
+_FIRST_PAINT_ROWS = 100
+
+# Oltre questo numero di righe da togliere conviene ripopolare: remove_row ricostruisce l'indice delle righe ogni volta
+_DIFF_MAX_REMOVALS = 32
+
+
+def _trunc(text: str, limit: int) -> str:
+    """Tronca il testo a limit caratteri, puntini di sospensione compresi."""
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+# Foglio di stile dell'app, definito una sola volta a livello di modulo
+_APP_CSS = """
+BookManagerApp {
+    .datatable-container {
+        content-align: center middle;
+        padding: 0 0;
+    }
+
+    #tags_tree {
+        width: 15%;
+        padding: 1 1;
+    }
+}
+
+    /* anche se usato in main la button-row torna utile in altri posti */
+.button-row {
+    align-horizontal: center;
+    align-vertical: top;
+    height: 5;
+    padding: 0 0;
+
+    #search_input {
+        width: 50%;
+    }
+}
+
+.hidden {
+    display: none;
+}
+
+.center-label {
+    content-align: right middle;
+    background: $primary-background;
+    height: 3;
+    width: 1fr;
+}
+
+Grid {
+    border: solid $primary;
+    padding: 2 4;
+    height: auto;
+    grid-size: 2;
+    grid-columns: auto 1fr;
+    width: 80%;
+
+    Label {
+        padding: 1;
+    }
+
+    Input {
+        width: 70%;
+    }
+
+    TextArea {
+        padding: 1;
+        width: 70%;
+        height: 3fr;
+    }
+}
+
+#filtered_dir_tree_container {
+    width: 80%;
+    align: center middle;
+}
+"""
+
 class BookManagerApp(App):
+    class CacheReloaded(Message):
+        """I libri riletti dal DB dal worker di ricarica, già ordinati per data di aggiunta, e la mappa uuid -> libro."""
+        def __init__(self, books: list, uuid_to_book: dict, generation: int) -> None:
+            self.books = books
+            self.uuid_to_book = uuid_to_book
+            self.generation = generation # Valore di _cache_generation quando è partita la lettura
+            super().__init__()
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -47,7 +141,8 @@ class BookManagerApp(App):
             db = ConfigReader().DB
             tinydb_path = Path(f"{db}")
 
-            self._db = TinyDB(f"{tinydb_path}", encoding='utf-8')
+            # Letture servite dalla memoria; le scritture vanno su disco con flush() esplicito
+            self._db = TinyDB(f"{tinydb_path}", storage=CachingMiddleware(OrjsonStorage), encoding='utf-8')
         except (UnicodeDecodeError, json.JSONDecodeError) as e:
             self.log.error(f"❌Database {tinydb_path} corrotto o illeggibile: {e}. Creazione/uso di un nuovo database.")
         except FileNotFoundError:
@@ -61,10 +156,20 @@ class BookManagerApp(App):
 
         self._cache_books = []
         self._uuid_to_book = {}
+        self._cache_generation = 0 # Cambia ad ogni modifica sul posto della cache: scarta le ricariche partite prima
+        self._row_cache: dict[str, tuple] = {} # uuid -> riga già formattata per la tabella
+        self._search_index: dict[str, set[str]] = {} # parola (minuscola) -> uuid dei libri che la contengono
         self._current_uuid = None
         self._selected_row = None
-        self._all_tags: list[str] = []
-        self._all_authors: list[str] = []
+        # Quanti libri per autore/tag: aggiornati ad ogni inserimento/cancellazione, senza riscandire la cache
+        self._authors_counter: Counter[str] = Counter()
+        self._tags_counter: Counter[str] = Counter()
+        self._table_fill_token = 0 # Cambia ad ogni ripopolamento: invalida i riempimenti differiti
+        self._current_row_keys: set[str] = set() # uuid delle righe presenti in tabella
+        self._exiftool: ExifToolProcess | None = None # Avviato al primo salvataggio, resta aperto
+        self._search_timer: Timer | None = None # Ricerca/filtro in attesa (debounce)
+        self._library_root: Path | None = None
+        self._library_root_resolved_str = "" # Prefisso per verificare che un file sia dentro LIBRARY
 
 
     def compose(self) -> ComposeResult:
@@ -74,12 +179,10 @@ class BookManagerApp(App):
                 with TabbedContent(id="main_tabs", initial="list"):
                     with TabPane("Book List", id="list"):
                         yield self._build_book_table_container()
-                    with TabPane("Details", id="details_pane"):
-                        yield BookDetails(id="book_details", db=self._db)
-                    with TabPane("Add Book", id="add_new_book_pane"):
-                        yield AddNewBook(id="add_new_book")
-                    with TabPane("Config", id="config_pane"):
-                        yield ConfigEditor(id="config_editor")
+                    # Gli altri tab restano vuoti fino alla prima apertura (vedi _mount_tab_widget)
+                    yield TabPane("Details", id="details_pane")
+                    yield TabPane("Add Book", id="add_new_book_pane")
+                    yield TabPane("Config", id="config_pane")
 
         with Horizontal(classes="button-row"):
             yield Button("Delete Book", id="btndelete", variant="error")
@@ -109,14 +212,51 @@ class BookManagerApp(App):
         self._table.add_columns("Added", "Title", "Author", "Tags")
         self._table.focus()
 
+        self._cache_library_root()
         self._update_table([])
 
 
-    def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+    def on_unmount(self) -> None:
+        # Scrive su disco eventuali modifiche ancora in cache
+        self._db.close()
+        if self._exiftool is not None:
+            self._exiftool.close()
+
+
+    def _cache_library_root(self) -> None:
+        """Risolve LIBRARY una volta sola: resolve() interroga il filesystem ad ogni chiamata."""
+        self._library_root = Path(ConfigReader.LIBRARY)
+        self._library_root_resolved_str = str(self._library_root.resolve())
+
+
+    @on(ConfigEditor.SaveRequested)
+    def handle_config_saved(self, event: ConfigEditor.SaveRequested) -> None:
+        library = event.new_config.get("paths", {}).get("library")
+        if library and library != ConfigReader.LIBRARY:
+            ConfigReader.LIBRARY = library
+            ConfigReader.LIBRARY_PATH = Path(library)
+            self._cache_library_root()
+
+
+    async def _mount_tab_widget(self, pane: TabPane, widget_type: type, **kwargs):
+        """Restituisce il widget del tab, creandolo e montandolo alla prima apertura."""
+        existing = pane.query(widget_type)
+        if existing:
+            return existing.first()
+        widget = widget_type(**kwargs)
+        await pane.mount(widget)
+        return widget
+
+
+    async def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        if event.tab.id == "--content-tab-config_pane":
+            await self._mount_tab_widget(event.pane, ConfigEditor, id="config_editor")
+            return
+
         if event.tab.id == "--content-tab-add_new_book_pane":
-            addnewbook = self.query_one(AddNewBook)
-            addnewbook.authors = self._all_authors
-            addnewbook.tags = self._all_tags
+            addnewbook = await self._mount_tab_widget(event.pane, AddNewBook, id="add_new_book")
+            addnewbook.authors = tuple(self._authors_counter)
+            addnewbook.tags = tuple(self._tags_counter)
             return
 
         if event.tab.id == "--content-tab-details_pane":
@@ -133,7 +273,7 @@ class BookManagerApp(App):
                 active_tab_content.active = "list"
                 return
 
-            details = self.query_one(BookDetails)
+            details = await self._mount_tab_widget(event.pane, BookDetails, id="book_details", db=self._db)
             details.book_data = book
 
 
@@ -176,9 +316,8 @@ class BookManagerApp(App):
             self.notify("Selected book data not found", severity="error")
             return
 
-        # Usa la property LIBRARY letta da Config
-        library_path = Path(ConfigReader.LIBRARY)
-        author = book.get('author', 'Unknown Author')
+        # Usa LIBRARY letta da Config (già risolta in on_mount)
+        author = book['author']
         filename = book.get('filename')
 
         if not filename:
@@ -186,10 +325,10 @@ class BookManagerApp(App):
              return
 
         try:
-            filepath = (library_path / author / filename).resolve()
+            filepath = (self._library_root / author / filename).resolve()
 
             # Verifica aggiuntiva che il percorso risolto sia ancora dentro LIBRARY
-            if not str(filepath).startswith(str(library_path.resolve())):
+            if not str(filepath).startswith(self._library_root_resolved_str):
                  self.notify("❌ Invalid file path (outside library)", severity="error")
                  return
 
@@ -201,10 +340,15 @@ class BookManagerApp(App):
             self.notify(f"🚀 Opening {filepath.name}...") # Feedback utente
             if os.name == 'nt': # Windows
                 os.startfile(filepath)
-            elif sys.platform == 'darwin': # macOS
-                 os.system(f'open "{filepath}"')
-            else: # Linux/Altri Unix
-                os.system(f'xdg-open "{filepath}"')
+            else: # macOS / Linux e altri Unix: niente shell, il percorso è un solo argomento
+                opener = "open" if sys.platform == 'darwin' else "xdg-open"
+                subprocess.Popen(
+                    [opener, str(filepath)],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True, # Il visualizzatore non dipende dal terminale
+                )
 
         except OSError as e:
              self.notify(f"❌ OS Error opening file: {e}", severity="error")
@@ -216,105 +360,261 @@ class BookManagerApp(App):
 
     def _update_table(self, books_to_display=None) -> None:
         """Aggiorna la tabella e l'albero dei tag se necessario."""
+        # 1. Aggiorna cache se necessario
+        # Se books_to_display non è fornito O se la cache è vuota, ricarica dal DB:
+        # la lettura avviene in un thread e la tabella si ripopola all'arrivo di CacheReloaded
+        if books_to_display is None or not self._cache_books:
+            self._reload_cache()
+            return
+
+        self._populate_table(books_to_display)
+
+
+    def _reload_cache(self) -> None:
+        """Rilegge il DB fuori dal thread dell'interfaccia; una nuova richiesta annulla quella in corso."""
+        self.log.info("Refreshing book cache from database...")
+        generation = self._cache_generation
+        self.run_worker(lambda: self._load_books_sync(generation), thread=True, exclusive=True, group="cache_reload")
+
+
+    def _load_books_sync(self, generation: int) -> None:
+        """Eseguito nel worker: legge e ordina i libri, poi li consegna all'app con CacheReloaded."""
         try:
-            # 1. Aggiorna cache se necessario
-            # Se books_to_display non è fornito O se la cache è vuota, ricarica dal DB
-            if books_to_display is None or not self._cache_books:
-                self.log.info("Refreshing book cache from database...")
+            # Un solo passaggio per preparare i libri e costruire la mappa uuid, poi l'ordinamento sul posto
+            books = []
+            uuid_to_book = {}
+            skipped = 0
+            for book in self._db.all():
+                # Un record malformato si salta (e si segnala), senza perdere il resto della libreria
                 try:
-                    self._cache_books = sorted(self._db.all(), key=lambda x: x.get("added", ""), reverse=True)
-                    self._uuid_to_book = {book["uuid"]: book for book in self._cache_books}
-                    self.log.info(f"Cache updated with {len(self._cache_books)} books.")
-                except Exception as db_err:
-                    self.notify(f"❌Error reading database: {db_err}", severity="error")
-                    self._cache_books = [] # Svuota cache in caso di errore
-                    self._uuid_to_book = {}
-
-            if books_to_display is None or len(books_to_display) == 0:
+                    self._prepare_book(book)
+                    uuid_to_book[book["uuid"]] = book
+                except Exception as book_err:
+                    skipped += 1
+                    self.log.error(f"❌Skipping malformed book {book.get('uuid', 'N/A')}: {book_err}")
+                    continue
+                books.append(book)
+            books.sort(key=itemgetter("added"), reverse=True)
+            if skipped:
+                self.call_from_thread(self.notify, f"⚠️ {skipped} libri non validi ignorati (vedi log).", severity="warning")
+        except Exception as db_err:
+            self.call_from_thread(self.notify, f"❌Error reading database: {db_err}", severity="error")
+            books, uuid_to_book = [], {} # Svuota cache in caso di errore
+        self.post_message(self.CacheReloaded(books, uuid_to_book, generation))
+
+
+    def _prepare_book(self, book: dict) -> None:
+        """
+        Campi derivati calcolati una volta sola per libro: la data già formattata per la tabella
+        e le forme minuscole, così ricerche e filtri non rifanno lower() ad ogni query.
+        Completa anche i campi mancanti o vuoti (anche null), così il resto del codice può usare book["campo"].
+        """
+        book["title"] = book.get("title") or "No Title"
+        book["author"] = book.get("author") or "Unknown Author"
+        book["tags"] = book.get("tags") or []
+        added = book.get("added")
+        book["added"] = added if isinstance(added, str) else "" # Serve una stringa ISO per l'ordinamento
+        if isinstance(book["author"], str):
+            book["author"] = sys.intern(book["author"]) # Gli stessi autori ricorrono in molti libri
+
+        book["_added_display"] = self._safe_fromisoformat(book)
+        book["_title_lower"] = book["title"].lower()
+        book["_author_lower"] = book["author"].lower()
+        book["_tags_lower"] = frozenset(t.lower() for t in book["tags"])
+
+
+    def _safe_fromisoformat(self, book: dict) -> str:
+        """Data di aggiunta formattata, oppure "N/A" / "Error" se manca o non è valida."""
+        try:
+            added_formatted = "N/A"
+            if added_ts := book["added"]:
+                 try:
+                     added_formatted = FormattedDateTime.fromisoformat(added_ts)
+                 except (ValueError, TypeError):
+                     self.log.warning(f"Invalid date format for book {book.get('uuid', 'N/A')}: {added_ts}")
+        except Exception as date_err:
+             self.log.error(f"❌Error processing date for book {book.get('uuid', 'N/A')}: {date_err}")
+             added_formatted = "Error"
+        return added_formatted
+
+
+    def _add_book_to_cache(self, book: dict) -> None:
+        """Aggiunge un libro appena inserito nel DB a cache e indici, senza rileggere tutto il file."""
+        self._prepare_book(book)
+        self._cache_generation += 1
+        self._cache_books.insert(0, book) # Il più recente: la cache è ordinata per data di aggiunta decrescente
+        self._uuid_to_book[book["uuid"]] = book
+        self._index_book(self._search_index, book)
+        self._count_book(book, 1)
+
+
+    def _count_book(self, book: dict, delta: int) -> None:
+        """Aggiorna i contatori autori/tag per un libro aggiunto (+1) o rimosso (-1)."""
+        if author := book["author"]: # Solo autori non vuoti
+            self._authors_counter[author] += delta
+            if self._authors_counter[author] <= 0:
+                del self._authors_counter[author]
+        for tag in book["tags"]:
+            self._tags_counter[tag] += delta
+            if self._tags_counter[tag] <= 0:
+                del self._tags_counter[tag]
+
+
+    @on(CacheReloaded)
+    def on_cache_reloaded(self, message: CacheReloaded) -> None:
+        if message.generation != self._cache_generation:
+            # La cache è stata modificata (aggiunta/cancellazione) durante la lettura: questo risultato
+            # è vecchio e sovrascriverebbe la modifica. Si rilegge il DB, che la contiene già
+            self._reload_cache()
+            return
+        self._cache_books = message.books
+        self._uuid_to_book = message.uuid_to_book
+        self._row_cache = {}
+        self._build_search_index()
+        self.log.info(f"Cache updated with {len(self._cache_books)} books.")
+
+        # Contatori autori e tag (basati sulla cache completa)
+        self._authors_counter = Counter(book["author"] for book in self._cache_books if book["author"])
+        self._tags_counter = Counter(tag for book in self._cache_books for tag in book["tags"])
+
+        self._populate_table(self._cache_books, full_refresh=True) # Le righe possono essere cambiate
+
+
+    def _populate_table(self, books_to_display: list, full_refresh: bool = False) -> None:
+        """Ripopola la tabella con i libri indicati (tutta la cache se la lista è vuota)."""
+        try:
+            if not books_to_display:
                  books_to_display = self._cache_books
 
-            # 2. Ricostruisci l'albero dei tag solo se è vuoto (la prima volta o dopo un clear)
-            # if not self._tags_tree.root.children:
-            #     self.log.info("Building tags tree...")
-            #     self._build_tags_tree() # Ora usa la nuova logica
-
-            # 3. Aggiorna lista autori (basata sulla cache completa)
-            if not self._all_authors:
-                self._all_authors = sorted(list(set(
-                    book["author"] for book in self._cache_books
-                    if book.get("author") # Assicura che la chiave esista e non sia vuota/None
-                )))
-
-            if not self._all_tags or books_to_display is None: # Ricalcola se forzato o vuoto
-                all_tags_flat = set()
-                for book in self._cache_books:
-                    for tag in book.get("tags", []):
-                        all_tags_flat.add(tag)
-                self._all_tags = sorted(list(all_tags_flat))
-
-            # 4. Popola la tabella con i libri da visualizzare (filtrati o tutti)
+            # Se i libri da mostrare sono già tutti in tabella (stessi o meno, nello stesso ordine
+            # della cache) basta togliere quelli spariti invece di ricostruire la tabella
+            if not full_refresh and books_to_display:
+                new_keys = {book["uuid"] for book in books_to_display}
+                removed = self._current_row_keys - new_keys
+                if new_keys <= self._current_row_keys and len(removed) <= _DIFF_MAX_REMOVALS:
+                    self._table_fill_token += 1 # Le righe ancora in attesa non sono tra quelle richieste
+                    for key in removed:
+                        self._table.remove_row(key)
+                    self._current_row_keys = new_keys
+                    return
+
+            # 2. Popola la tabella con i libri da visualizzare (filtrati o tutti)
+            self._table_fill_token += 1
             self._table.clear()
+            self._current_row_keys = set()
             if not books_to_display:
                  self.log.warning("No books to display in the table.")
                  self._table.add_row("---", "No books found", "---", "---")
                  return # Esce se non ci sono libri
 
             self.log.info(f"Populating table with {len(books_to_display)} books.")
+            # Righe formattate una sola volta per libro: ricerche e filtri le riusano dalla cache
+            row_cache = self._row_cache
+            format_book_row = self._format_book_row
             rows = []
+            append = rows.append
             for book in books_to_display:
-                try:
-                    added_formatted = "N/A"
-                    if added_ts := book.get("added"):
-                         try:
-                             added_formatted = FormattedDateTime.fromisoformat(added_ts)
-                         except (ValueError, TypeError):
-                             self.log.warning(f"Invalid date format for book {book.get('uuid', 'N/A')}: {added_ts}")
-                except Exception as date_err:
-                     self.log.error(f"❌Error processing date for book {book.get('uuid', 'N/A')}: {date_err}")
-                     added_formatted = "Error"
-
-                title = book.get("title", "No Title")
-                author = book.get("author", "Unknown Author")
-                tags_list = book.get("tags", [])
-                tags_display = ", ".join(tags_list) if tags_list else "No Tags"
-
-                # Limita lunghezza per display
-                title_display = title[:77] + "..." if len(title) > 80 else title
-                author_display = author[:27] + "..." if len(author) > 30 else author
-
-                rows.append((
-                    added_formatted,
-                    title_display,
-                    author_display,
-                    tags_display,
-                ))
-
-            # keys = [book["uuid"] for book in books_to_display]
-
-            for i, book in enumerate(books_to_display):
-                row_data = rows[i]  # Get the pre-formatted row data
-                key = book["uuid"] # Get the key for this book
-                # Add the row using add_row, unpacking the data and providing the key
-                self._table.add_row(*row_data, key=key)
+                row_data = row_cache.get(book["uuid"])
+                if row_data is None:
+                    row_data = row_cache[book["uuid"]] = format_book_row(book)
+                append(row_data)
+
+            # Subito solo le righe della prima schermata (più un margine), il resto dopo il refresh:
+            # il tempo della prima visualizzazione non cresce con la dimensione della libreria
+            first_paint = max(self._table.size.height, _FIRST_PAINT_ROWS)
+            self._add_book_rows(books_to_display[:first_paint], rows[:first_paint])
+            if len(books_to_display) > first_paint:
+                self.call_after_refresh(
+                    self._add_deferred_book_rows,
+                    self._table_fill_token,
+                    books_to_display[first_paint:],
+                    rows[first_paint:])
 
         except Exception as e:
             self.log.error(f"Critical error during table update: {e}", exc_info=True)
             self.notify(f"Error updating table: {e}", severity="error")
 
 
+    def _format_book_row(self, book: dict) -> tuple:
+        """Prepara la riga della tabella (data, titolo, autore, tag) per un libro."""
+        title = book["title"]
+        author = book["author"]
+        tags_list = book["tags"]
+        tags_display = ", ".join(tags_list) if tags_list else "No Tags"
+
+        # Limita lunghezza per display (gli autori si ripetono: una sola copia della stringa per tutte le righe)
+        title_display = _trunc(title, 80)
+        author_display = sys.intern(_trunc(author, 30))
+
+        return (
+            book["_added_display"],
+            title_display,
+            author_display,
+            tags_display,
+        )
+
+
+    def _add_book_rows(self, books: list, rows: list) -> None:
+        """Aggiunge alla tabella le righe già formattate, con l'uuid del libro come chiave."""
+        add_row = self._table.add_row # Risolto una volta sola, fuori dal ciclo
+        for book, row_data in zip(books, rows):
+            add_row(*row_data, key=book["uuid"])
+        self._current_row_keys.update(book["uuid"] for book in books)
+
+
+    def _add_deferred_book_rows(self, fill_token: int, books: list, rows: list) -> None:
+        """Completa la tabella, a meno che nel frattempo non sia stata ripopolata."""
+        if fill_token != self._table_fill_token:
+            return
+        self._add_book_rows(books, rows)
+
+
+    def _build_search_index(self) -> None:
+        """Indice inverso parola -> uuid su titolo, autore e tag, ricostruito ad ogni ricarica della cache."""
+        index: dict[str, set[str]] = {}
+        for book in self._cache_books:
+            self._index_book(index, book)
+        self._search_index = index
+
+
+    @staticmethod
+    def _book_words(book: dict) -> list[str]:
+        """Le parole (minuscole) di titolo, autore e tag con cui il libro è indicizzato."""
+        words = book["_title_lower"].split() + book["_author_lower"].split()
+        for tag in book["_tags_lower"]:
+            words.extend(tag.split())
+        return words
+
+
+    @classmethod
+    def _index_book(cls, index: dict[str, set[str]], book: dict) -> None:
+        book_uuid = book["uuid"]
+        for word in cls._book_words(book):
+            index.setdefault(word, set()).add(book_uuid)
+
+
     def _run_search(self, search_term: str):
         """Filtra i libri nella cache basandosi sul termine di ricerca."""
         search_term_lower = search_term.lower()
         self.log.info(f"Running search for: '{search_term}'")
 
         # Filtra sulla cache, non ricaricare dal DB qui
-        results = [
-            book for book in self._cache_books
-            if (search_term_lower in book.get("title", "").lower() or
-                search_term_lower in book.get("author", "").lower() or
-                # Cerca nei tag (assumendo siano nomi puliti nel DB)
-                any(search_term_lower in tag.lower() for tag in book.get("tags", [])))
-        ]
+        if not any(char.isspace() for char in search_term_lower):
+            # Un termine senza spazi è sottostringa del titolo/autore/tag solo se lo è di una sua parola:
+            # basta scorrere il vocabolario dell'indice invece di tutti i libri
+            matching = set()
+            for word, uuids in self._search_index.items():
+                if search_term_lower in word:
+                    matching |= uuids
+            results = [book for book in self._cache_books if book["uuid"] in matching]
+        else:
+            results = [
+                book for book in self._cache_books
+                if (search_term_lower in book["_title_lower"] or
+                    search_term_lower in book["_author_lower"] or
+                    # Cerca nei tag (assumendo siano nomi puliti nel DB)
+                    any(search_term_lower in tag for tag in book["_tags_lower"]))
+            ]
         self.log.info(f"Search found {len(results)} results.")
         # Aggiorna la tabella solo con i risultati
         self._update_table(results)
@@ -326,7 +626,7 @@ class BookManagerApp(App):
 
         results = [
             book for book in self._cache_books
-            if tag_lower in [t.lower() for t in book.get("tags", [])]
+            if tag_lower in book["_tags_lower"]
         ]
         self.log.info(f"Filter found {len(results)} books with tag '{tag_to_filter}'.")
         self._update_table(results)
@@ -344,22 +644,38 @@ class BookManagerApp(App):
             self.notify("❌Cannot find data for the selected book.", severity="error")
             return
 
-        # Assumi che YesOrNo accetti una callback `on_confirm` o simile
-        # che viene chiamata con True/False
-        # self.push_screen(YesOrNo(self._db, self._current_uuid, book["title"], on_confirm=refresh_after_delete))
-
-        # Se YesOrNo non ha callback, aggiorna sempre dopo la chiusura (meno ideale)
+        # La tabella si aggiorna solo se la cancellazione avviene (YesOrNo.BookDeleted)
         self.push_screen(YesOrNo(self._db, self._current_uuid, book["title"]))
-        # TODO: Idealmente YesOrNo dovrebbe emettere un messaggio o chiamare una callback
-        # per aggiornare la tabella *solo* se la cancellazione avviene.
-        # Per ora, aggiorniamo comunque al ritorno:
-        self.call_after_refresh(lambda: self._update_table([]))
+
+
+    @on(YesOrNo.BookDeleted)
+    def handle_book_deleted(self, event: YesOrNo.BookDeleted) -> None:
+        """Toglie il libro cancellato da cache, indici e tabella, senza rileggere il DB."""
+        book = self._uuid_to_book.pop(event.uuid, None)
+        if book is None:
+            return
+        self._cache_generation += 1
+        self._cache_books.remove(book)
+        self._row_cache.pop(event.uuid, None)
+        self._count_book(book, -1)
+        for word in self._book_words(book):
+            uuids = self._search_index.get(word)
+            if uuids is not None:
+                uuids.discard(event.uuid)
+                if not uuids:
+                    del self._search_index[word]
+
+        if event.uuid in self._current_row_keys:
+            self._table.remove_row(event.uuid)
+            self._current_row_keys.discard(event.uuid)
+        if self._current_uuid == event.uuid:
+            self._current_uuid = None
 
 
     @on(Button.Pressed, "#btnrefresh")
     def handle_refresh(self, event: Button.Pressed) -> None:
         self.notify("🔄 Refreshing data...")
-        self._update_table([]) # Forza ricaricamento completo da DB
+        self._update_table() # Forza ricaricamento completo da DB
 
 
     @on(Button.Pressed, "#btnopen_file")
@@ -368,32 +684,28 @@ class BookManagerApp(App):
 
 
     @on(BookDetails.OpenFileRequest)
-    def handle_open_file_request(self, event: BookDetails.OpenFileRequest) -> None:
+    def handle_book_open_request(self, event: BookDetails.OpenFileRequest) -> None:
         """Gestisce la richiesta di apertura file dal pannello dettagli."""
-        # Trova l'UUID corrispondente ai dati ricevuti
-        found_uuid = None
-        for uuid, book in self._uuid_to_book.items():
-            # Confronta usando un identificatore univoco se possibile (es. uuid)
-            if book.get("uuid") == event.book_data.get("uuid"):
-                 found_uuid = uuid
-                 break
-        # Se non trovi per uuid, prova un confronto più lasco (meno affidabile)
-        if not found_uuid:
-             for uuid, book in self._uuid_to_book.items():
-                  if book == event.book_data:
-                       found_uuid = uuid
-                       break
-
-        if found_uuid:
+        # Trova l'UUID corrispondente ai dati ricevuti (accesso diretto alla mappa, niente scansioni)
+        found_uuid = event.book_data.get("uuid")
+
+        if found_uuid in self._uuid_to_book:
             self._current_uuid = found_uuid # Imposta l'UUID corrente
             self._open_file() # Chiama l'apertura file
         else:
             self.notify("❌Could not match book details to open file.", severity="error")
 
 
-    def on_input_submitted(self, event: Input.Submitted) -> None:
-        """Gestisce la ricerca dall'input."""
-        search_value = event.value.strip()
+    _SEARCH_DEBOUNCE = 0.2 # Secondi di pausa nella digitazione prima di eseguire la ricerca
+
+    def _debounce(self, callback, *args) -> None:
+        """Esegue callback dopo _SEARCH_DEBOUNCE secondi, annullando quella ancora in attesa."""
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        self._search_timer = self.set_timer(self._SEARCH_DEBOUNCE, lambda: callback(*args))
+
+
+    def _apply_search(self, search_value: str) -> None:
         if len(search_value) >= 3: # Minimo 3 caratteri per la ricerca
             self._run_search(search_value)
         elif not search_value: # Se l'input è vuoto, mostra tutto
@@ -401,6 +713,17 @@ class BookManagerApp(App):
             self._update_table([]) # Mostra tutti i libri dalla cache
 
 
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Gestisce la ricerca dall'input."""
+        self._debounce(self._apply_search, event.value.strip())
+
+
+    @on(Input.Changed, "#search_input")
+    def on_search_input_changed(self, event: Input.Changed) -> None:
+        """Ricerca mentre si digita: parte solo quando l'utente si ferma."""
+        self._debounce(self._apply_search, event.value.strip())
+
+
     def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
         """ Aggiorna l'UUID corrente e i dettagli quando una riga è selezionata """
         if event.row_key.value is not None:
@@ -425,7 +748,7 @@ class BookManagerApp(App):
 
         fileinfo = new_book_data.get("fileinfo")
         author = new_book_data.get("author")
-        author_path = Path(f"{ConfigReader.LIBRARY}/{author}")
+        author_path = self._library_root / author
         stem = fileinfo.get("stem") # non usato al momento
         ext = fileinfo.get("extension")
         title = new_book_data.get("title")
@@ -433,8 +756,8 @@ class BookManagerApp(App):
         src_file = fileinfo.get("full_path")
 
         new_file_name = f"{title} - {author}{ext}"
-        new_file_path = Path(f"{ConfigReader.LIBRARY}/{author}/{new_file_name}")
-        tags_list = sorted([t.strip() for t in tags if t.strip()])
+        new_file_path = author_path / new_file_name
+        tags_list = sorted(tags) # AddNewBook sends them already stripped, without empty ones
 
         try:
             validate_filename(new_file_name, platform="universal")
@@ -458,8 +781,7 @@ class BookManagerApp(App):
             try:
                 keywords_str = ",".join(tags)
 
-                exiftool_cmd = [
-                    str(Path(ConfigReader.EXIFTOOL_PATH)),
+                exiftool_args = [
                     "-charset", "utf8", # Use UTF-8 for metadata
                     f"-Title={title}",
                     f"-Author={author}",
@@ -467,12 +789,12 @@ class BookManagerApp(App):
                     "-overwrite_original", # Overwrite the copied file
                     str(new_file_path) # Pass path as string
                 ]
-                self.log.info(f"Running exiftool: {' '.join(exiftool_cmd)}") # Log the command
-                # Capture output for better error reporting
-                result = subprocess.run(exiftool_cmd, check=True, capture_output=True, text=True, encoding='utf-8')
-                self.log.info(f"Exiftool output: {result.stdout}")
-                if result.stderr:
-                     self.log.warning(f"Exiftool stderr: {result.stderr}") # Log warnings
+                self.log.info(f"Running exiftool: {' '.join(exiftool_args)}") # Log the command
+                # One persistent exiftool process (-stay_open) instead of a new one per book
+                if self._exiftool is None:
+                    self._exiftool = ExifToolProcess(str(Path(ConfigReader.EXIFTOOL_PATH)))
+                output = self._exiftool.execute(*exiftool_args)
+                self.log.info(f"Exiftool output: {output}")
 
             except FileNotFoundError:
                  self.notify(f"❌ Exiftool not found at: {ConfigReader.EXIFTOOL_PATH}. Metadata not written.", severity="error")
@@ -502,12 +824,15 @@ class BookManagerApp(App):
 
             # Insert into database
             self._db.insert(book_data)
+            self._db.storage.flush()
             self.log.info(f"Book data inserted into DB for UUID: {book_data['uuid']}")
 
             self.notify("✅ Book added successfully!", severity="information")
 
-            self._cache_books = []  # Clear cache to force reload
-            self._update_table([])
+            # No full reload: add the new book to the in-memory cache and redraw from it
+            self._add_book_to_cache(book_data)
+            self._populate_table(self._cache_books)
+            self._table.move_cursor(row=0)
             # self.query_one(TabbedContent).active = "list"
 
         except OSError as e:
@@ -526,78 +851,17 @@ class BookManagerApp(App):
         clean_tag_name = event.node.data
 
         if clean_tag_name and isinstance(clean_tag_name, str):
-            self._filter_on_tags(clean_tag_name)
+            self._debounce(self._filter_on_tags, clean_tag_name)
 
             search_input = self.query_one("#search_input", Input)
             if search_input.value:
-                 search_input.value = ""
+                 # Svuotare l'input non deve far partire la ricerca "mostra tutto"
+                 with self.prevent(Input.Changed):
+                     search_input.value = ""
                  self.notify(f"Filtered by tag: {clean_tag_name}", title="Filter Active")
         else:
             self.log.info("Root node or node without data selected, showing all.")
             # self._update_table([]) # O non fare nulla
             pass # Non fare nulla se non c'è un tag valido
 
-    CSS = """
-BookManagerApp {
-    .datatable-container {
-        content-align: center middle;
-        padding: 0 0;
-    }
-
-    #tags_tree {
-        width: 15%;
-        padding: 1 1;
-    }
-}
-
-    /* anche se usato in main la button-row torna utile in altri posti */
-.button-row {
-    align-horizontal: center;
-    align-vertical: top;
-    height: 5;
-    padding: 0 0;
-
-    #search_input {
-        width: 50%;
-    }
-}
-
-.hidden {
-    display: none;
-}
-
-.center-label {
-    content-align: right middle;
-    background: $primary-background;
-    height: 3;
-    width: 1fr;
-}
-
-Grid {
-    border: solid $primary;
-    padding: 2 4;
-    height: auto;
-    grid-size: 2;
-    grid-columns: auto 1fr;
-    width: 80%;
-
-    Label {
-        padding: 1;
-    }
-
-    Input {
-        width: 70%;
-    }
-
-    TextArea {
-        padding: 1;
-        width: 70%;
-        height: 3fr;
-    }
-}
-
-#filtered_dir_tree_container {
-    width: 80%;
-    align: center middle;
-}
-"""
\ No newline at end of file
+    CSS = _APP_CSS
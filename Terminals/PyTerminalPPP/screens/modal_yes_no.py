@@ -1,3 +1,4 @@
+from textual.message import Message
 from textual.screen import ModalScreen
 from textual.containers import Grid
 from textual.widgets import Button, Label
@@ -6,6 +7,12 @@ from tinydb import Query
 class YesOrNo(ModalScreen):
     CSS_PATH="mymodal.tcss"
 
+    class BookDeleted(Message):
+        """Inviato all'app solo se il libro è stato davvero rimosso dal db."""
+        def __init__(self, uuid: str) -> None:
+            self.uuid = uuid
+            super().__init__()
+
     def __init__(self, db, uuid, title, name = None, id = None, classes = None):       
         super().__init__(name, id, classes)
 
@@ -33,7 +40,9 @@ class YesOrNo(ModalScreen):
                 self.notify(f"❌ Il libro {self._title} non è stato trovato nel db", severity="error")
             else:
                 removed = self._db.remove(Book.uuid == self._uuid)
+                self._db.storage.flush()
                 self.notify(f"✅ Rimosso {removed} libro/i con UUID {self._uuid}")
+                self.app.post_message(self.BookDeleted(self._uuid))
 
             self.dismiss(True)
             return
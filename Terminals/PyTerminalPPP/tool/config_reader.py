@@ -1,12 +1,22 @@
 import os
+from pathlib import Path
 import json # Importa la libreria json integrata
-from typing import Dict, List, Any # Aggiunto Any per una maggiore flessibilità nei tipi
+import threading
+from collections import deque
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple # Aggiunto Any per una maggiore flessibilità nei tipi
+
+try:
+    import orjson # Parser JSON in C, opzionale
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads # json.loads accetta anche bytes
 
 # Rimuovi 'import yaml' se non serve più per altro
 
 class ConfigReader:
     _instance = None
     _loaded = False
+    _lock = threading.Lock() # Creazione dell'istanza e caricamento una sola volta anche tra thread (worker Textual)
 
     # Il percorso ora punta a config.json di default
     CONFIGPATH: str = os.path.join(os.path.dirname(__file__), "config.json")
@@ -15,19 +25,34 @@ class ConfigReader:
     DB: str = ""
     LIBRARY: str = ""
     MAIN_UPLOAD_DIR: str = ""
+    # Gli stessi percorsi come Path, costruiti una volta al caricamento
+    LIBRARY_PATH: Path = Path(LIBRARY)
+    MAIN_UPLOAD_DIR_PATH: Path = Path(MAIN_UPLOAD_DIR)
     EXIFTOOL_PATH: str = ""
     TAGS_HIERARCHY: Dict[str, Any] = {} # Usa Any per gestire sotto-dizionari annidati
     TAGS_ICONS: Dict[str, str] = {}
     FLAT_TAGS: List[str] = []
     ALLOWED_EXTENSIONS = {".pdf", ".docx", ".epub"}
     TAG_ICONS: Dict[str, str] = {} # Mappa icone (era duplicato, ora è corretto)
+    TAG_DISPLAY: Dict[str, str] = {} # Nome con icona per ogni tag noto, calcolato al caricamento
+    _all_tags_cache: Optional[List[str]] = None # Risultato di get_all_tags, calcolato ad ogni caricamento
+    _DEFAULT_ICON: str = "" # Icona 'default' di TAG_ICONS, letta una volta al caricamento
+    # Gerarchia nei due sensi, costruita al caricamento
+    _PARENT_TO_CHILDREN: Dict[str, List[str]] = {}
+    _CHILD_TO_PARENT: Dict[str, str] = {}
+    # Tag padre principali: tupla immutabile per get_parent_tags, frozenset per i test di appartenenza
+    _PARENT_TAGS_TUPLE: Tuple[str, ...] = ()
+    _PARENT_TAGS_SET: FrozenSet[str] = frozenset()
 
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            # cls._loaded = False # Non serve resettare qui, viene fatto in _load_config
-            cls._load_config() # Carica subito alla prima istanziazione
+            with cls._lock:
+                # Ricontrolla: un altro thread può aver creato l'istanza mentre si attendeva il lock
+                if cls._instance is None:
+                    # Il caricamento avviene prima di pubblicare l'istanza: chi la vede trova la config pronta
+                    cls._load_config() # Carica subito alla prima istanziazione
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     @classmethod
@@ -40,16 +65,11 @@ class ConfigReader:
         # Usa il percorso definito nella classe
         json_path = cls.CONFIGPATH
 
-        if not os.path.exists(json_path):
-            print(f"⚠️ Attenzione: File di configurazione '{json_path}' non trovato. Verranno usati i valori di default.")
-            cls._loaded = True # Considera caricato anche se il file non c'è, per evitare tentativi ripetuti
-            return
-
         try:
-            # Apri e leggi il file JSON
-            with open(json_path, 'r', encoding='utf-8') as f:
-                # Usa json.load per parsare il file
-                config_data = json.load(f) or {}
+            # Apri e leggi il file JSON (niente os.path.exists preventivo: se manca lo dice open)
+            with open(json_path, 'rb') as f:
+                # Parsa i byte del file (con orjson se installato; orjson.JSONDecodeError è un json.JSONDecodeError)
+                config_data = _json_loads(f.read()) or {}
 
             # Carica i percorsi usando .get con i valori di default della classe
             paths = config_data.get('paths', {})
@@ -57,6 +77,8 @@ class ConfigReader:
             cls.LIBRARY = paths.get('library', cls.LIBRARY)
             cls.MAIN_UPLOAD_DIR = paths.get('main_upload_dir', cls.MAIN_UPLOAD_DIR)
             cls.EXIFTOOL_PATH = paths.get('exiftool_path', cls.EXIFTOOL_PATH)
+            cls.LIBRARY_PATH = Path(cls.LIBRARY)
+            cls.MAIN_UPLOAD_DIR_PATH = Path(cls.MAIN_UPLOAD_DIR)
 
             # Carica i tag (gerarchia e piatti)
             tags_section = config_data.get('tags', {})
@@ -65,10 +87,21 @@ class ConfigReader:
 
             # Carica le icone dei tag
             cls.TAG_ICONS = config_data.get('tag_icons', cls.TAG_ICONS)
+            cls._DEFAULT_ICON = cls.TAG_ICONS.get("default", "")
+
+            # Unione di tag piatti e gerarchici, pronta per get_all_tags
+            cls._all_tags_cache = cls._collect_all_tags()
+            cls._build_hierarchy_maps()
+            cls.TAG_DISPLAY = {tag: cls._display_name(tag) for tag in cls._all_tags_cache}
+            cls._PARENT_TAGS_TUPLE = tuple(cls.TAGS_HIERARCHY)
+            cls._PARENT_TAGS_SET = frozenset(cls._PARENT_TAGS_TUPLE)
 
             cls._loaded = True
             print(f"✅ Configurazione caricata da '{json_path}'.")
 
+        except FileNotFoundError:
+            print(f"⚠️ Attenzione: File di configurazione '{json_path}' non trovato. Verranno usati i valori di default.")
+            cls._loaded = True # Considera caricato anche se il file non c'è, per evitare tentativi ripetuti
         # Gestisci errori specifici del JSON
         except json.JSONDecodeError as e:
             print(f"❌ Errore di parsing JSON in {json_path}: {e}")
@@ -78,56 +111,93 @@ class ConfigReader:
             cls._loaded = False # Fallito il caricamento
 
     # --- Metodi esistenti (rimangono invariati nel funzionamento) ---
+    # La configurazione è caricata all'import del modulo: i metodi non ricontrollano _loaded
 
     @classmethod
     def get_icon_for_tag(cls, tag_name: str) -> str:
         """Restituisce l'icona per un dato nome di tag."""
-        # Assicurati che la configurazione sia caricata
-        if not cls._loaded: cls._load_config()
-        return cls.TAG_ICONS.get(tag_name, cls.TAG_ICONS.get("default", "")) # Aggiunto fallback a icona 'default'
+        return cls.TAG_ICONS.get(tag_name, cls._DEFAULT_ICON) # Fallback all'icona 'default'
 
     @classmethod
     def get_tag_display_name(cls, tag_name: str) -> str:
         """Restituisce il nome del tag formattato con l'icona (se presente)."""
-        # Assicurati che la configurazione sia caricata
-        if not cls._loaded: cls._load_config()
+        display_name = cls.TAG_DISPLAY.get(tag_name)
+        if display_name is None: # Tag non presente nella configurazione
+            display_name = cls._display_name(tag_name)
+        return display_name
+
+    @classmethod
+    def _display_name(cls, tag_name: str) -> str:
         icon = cls.get_icon_for_tag(tag_name)
         return f"{icon} {tag_name}".strip()
 
     @classmethod
     def get_all_tags(cls) -> List[str]:
         """Restituisce una lista piatta di tutti i tag definiti (gerarchici e piatti)."""
-        if not cls._loaded: cls._load_config()
+        # La configurazione non cambia dopo il caricamento: la lista si calcola una volta sola
+        if cls._all_tags_cache is None:
+            cls._all_tags_cache = cls._collect_all_tags()
+        return list(cls._all_tags_cache) # Ritorna lista ordinata (una copia: il chiamante può modificarla)
+
+    @classmethod
+    def _collect_all_tags(cls) -> List[str]:
         all_tags_set = set(cls.FLAT_TAGS)
 
-        def extract_nested_tags(hierarchy: Dict[str, Any]):
-            for parent, children in hierarchy.items():
+        # Visita iterativa della gerarchia (niente ricorsione né limiti di profondità)
+        stack = deque([cls.TAGS_HIERARCHY])
+        while stack:
+            for parent, children in stack.pop().items():
                 all_tags_set.add(parent)
                 if isinstance(children, dict): # Se i figli sono un altro dizionario
-                    extract_nested_tags(children)
+                    stack.append(children)
                 elif isinstance(children, list): # Se i figli sono una lista (improbabile nella tua struttura, ma per sicurezza)
                     all_tags_set.update(children)
+        return sorted(all_tags_set)
 
-        extract_nested_tags(cls.TAGS_HIERARCHY)
-        return sorted(list(all_tags_set)) # Ritorna lista ordinata
+    @classmethod
+    def get_parent_tags(cls) -> Tuple[str, ...]:
+        """Restituisce i tag padre principali (nomi puliti), come tupla immutabile."""
+        return cls._PARENT_TAGS_TUPLE
 
     @classmethod
-    def get_parent_tags(cls) -> List[str]:
-        """Restituisce la lista dei tag padre principali (nomi puliti)."""
-        if not cls._loaded: cls._load_config()
-        return list(cls.TAGS_HIERARCHY.keys())
+    def is_parent_tag(cls, tag_name: str) -> bool:
+        """Indica se il tag è uno dei tag padre principali."""
+        return tag_name in cls._PARENT_TAGS_SET
 
     @classmethod
     def get_child_tags(cls, parent_tag: str) -> List[str]:
         """Restituisce la lista dei tag figli diretti per un genitore."""
-        if not cls._loaded: cls._load_config()
-        children = cls.TAGS_HIERARCHY.get(parent_tag, {})
-        if isinstance(children, dict):
-             # Se i figli sono un dizionario, restituisci le sue chiavi (che sono i sotto-tag)
-             return list(children.keys())
-        elif isinstance(children, list):
-             # Se (improbabilmente) i figli fossero una lista, restituiscila
-             return children
-        else:
-            # Se il genitore non esiste o non ha figli strutturati, ritorna lista vuota
-            return []
+        # Se il genitore non esiste o non ha figli strutturati, ritorna lista vuota
+        return list(cls._PARENT_TO_CHILDREN.get(parent_tag, ()))
+
+    @classmethod
+    def get_parent_tag(cls, child_tag: str) -> Optional[str]:
+        """Restituisce il tag genitore di un sotto-tag, oppure None."""
+        return cls._CHILD_TO_PARENT.get(child_tag)
+
+    @classmethod
+    def _build_hierarchy_maps(cls) -> None:
+        """Una sola visita della gerarchia per le mappe genitore -> figli e figlio -> genitore."""
+        parent_to_children: Dict[str, List[str]] = {}
+        child_to_parent: Dict[str, str] = {}
+        stack = deque([cls.TAGS_HIERARCHY])
+        while stack:
+            for parent, children in stack.pop().items():
+                if isinstance(children, dict):
+                    # Se i figli sono un dizionario, le sue chiavi sono i sotto-tag
+                    child_tags = list(children.keys())
+                    stack.append(children)
+                elif isinstance(children, list):
+                    # Se (improbabilmente) i figli fossero una lista, sono già i sotto-tag
+                    child_tags = children
+                else:
+                    continue
+                parent_to_children[parent] = child_tags
+                for child in child_tags:
+                    child_to_parent[child] = parent
+        cls._PARENT_TO_CHILDREN = parent_to_children
+        cls._CHILD_TO_PARENT = child_to_parent
+
+
+# Carica la configurazione una volta sola, all'import del modulo
+ConfigReader()
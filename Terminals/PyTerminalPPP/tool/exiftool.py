@@ -0,0 +1,61 @@
+import subprocess
+
+
+class ExifToolProcess:
+    """
+    Un unico processo exiftool in modalità -stay_open: l'avvio dell'interprete Perl
+    (la parte lenta di ogni chiamata) si paga una volta sola per tutta la vita dell'app.
+    """
+
+    _READY = "{ready}"
+
+    def __init__(self, executable: str) -> None:
+        self._executable = executable
+        self._process: subprocess.Popen | None = None
+
+    def _ensure_started(self) -> subprocess.Popen:
+        # Avvio pigro, e riavvio se il processo è terminato
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                [self._executable, "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+            )
+        return self._process
+
+    def execute(self, *args: str) -> str:
+        """
+        Esegue un comando exiftool (un argomento per riga) e ne restituisce l'output.
+
+        Raises:
+            FileNotFoundError: Se l'eseguibile exiftool non esiste.
+            subprocess.CalledProcessError: Se exiftool segnala un errore.
+        """
+        process = self._ensure_started()
+        process.stdin.write("\n".join(args) + "\n-execute\n")
+        process.stdin.flush()
+
+        output = []
+        for line in iter(process.stdout.readline, ""):
+            if line.rstrip() == self._READY:
+                break
+            output.append(line)
+        output = "".join(output)
+
+        if any(line.startswith("Error") for line in output.splitlines()):
+            raise subprocess.CalledProcessError(1, [self._executable, *args], output=output, stderr=output)
+        return output
+
+    def close(self) -> None:
+        """Chiede a exiftool di terminare."""
+        if self._process is not None and self._process.poll() is None:
+            try:
+                self._process.stdin.write("-stay_open\nFalse\n")
+                self._process.stdin.flush()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+        self._process = None
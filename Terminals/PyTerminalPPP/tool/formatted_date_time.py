@@ -18,7 +18,12 @@ class FormattedDateTime:
         # Ottieni l'ora corrente in UTC (scelta consigliata per evitare ambiguità)
         current_utc_time = datetime.now(timezone.utc)
         # Formatta secondo lo standard richiesto
-        return current_utc_time.strftime(cls._TARGET_FORMAT)
+        return cls._format(current_utc_time)
+
+    @staticmethod
+    def _format(dt: datetime) -> str:
+        """Formato fisso "YYYY-MM-DD HH:MM" costruito direttamente, senza strftime."""
+        return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
 
     @classmethod
     def fromisoformat(cls, iso_string: str) -> str:
@@ -36,10 +41,12 @@ class FormattedDateTime:
             ValueError: Se la stringa di input non è in formato ISO valido.
         """
         try:
-            # Parsifica la stringa ISO in un oggetto datetime
+            # Parsifica la stringa ISO in un oggetto datetime (la "Z" finale è capita solo da Python 3.11)
+            if iso_string.endswith("Z"):
+                iso_string = iso_string[:-1] + "+00:00"
             dt_object = datetime.fromisoformat(iso_string)
             # Formatta l'oggetto datetime nel formato desiderato
-            return dt_object.strftime(cls._TARGET_FORMAT)
+            return cls._format(dt_object)
         except ValueError as e:
             # Rilancia l'errore con un messaggio più specifico se il parsing fallisce
             raise ValueError(f"La stringa fornita non è un formato ISO 8601 valido: '{iso_string}'") from e
@@ -61,11 +68,18 @@ class FormattedDateTime:
             ValueError: Se la stringa di input non corrisponde al formato "YYYY-MM-DD HH:MM".
         """
         try:
-            # Parsifica la stringa ESATTAMENTE nel formato atteso per validarla
-            dt_object = datetime.strptime(raw_string, cls._TARGET_FORMAT)
-            # Riformatta (garantisce che l'output sia *esattamente* quello voluto)
-            # Anche se dt_object.__str__() potrebbe funzionare, strftime è esplicito.
-            return dt_object.strftime(cls._TARGET_FORMAT)
+            # Formato fisso: controlla separatori e cifre e lascia a datetime la validazione
+            # dei valori, senza passare per strptime (che riesamina il formato ad ogni chiamata)
+            if (len(raw_string) != 16
+                    or raw_string[4] != "-" or raw_string[7] != "-"
+                    or raw_string[10] != " " or raw_string[13] != ":"
+                    or not (raw_string[0:4] + raw_string[5:7] + raw_string[8:10]
+                            + raw_string[11:13] + raw_string[14:16]).isdigit()):
+                raise ValueError(raw_string)
+            datetime(int(raw_string[0:4]), int(raw_string[5:7]), int(raw_string[8:10]),
+                     int(raw_string[11:13]), int(raw_string[14:16]))
+            # Valida: la stringa è già esattamente nel formato voluto
+            return raw_string
         except ValueError as e:
             # Rilancia l'errore indicando il formato atteso
             raise ValueError(f"La stringa fornita '{raw_string}' non corrisponde al formato richiesto '{cls._TARGET_FORMAT}'") from e
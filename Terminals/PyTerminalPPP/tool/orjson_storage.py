@@ -0,0 +1,46 @@
+import io
+import os
+from typing import Any, Dict, Optional
+
+from tinydb.storages import JSONStorage
+
+try:
+    import orjson
+except ImportError: # orjson è opzionale: senza, si usa il json standard di TinyDB
+    orjson = None
+
+
+class OrjsonStorage(JSONStorage):
+    """JSONStorage di TinyDB che legge e scrive il file con orjson, molto più veloce del json standard"""
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if orjson is None:
+            return super().read()
+
+        # Dimensione del file: se è vuoto TinyDB deve inizializzare il database
+        self._handle.seek(0, os.SEEK_END)
+        if not self._handle.tell():
+            return None
+
+        self._handle.seek(0)
+        return orjson.loads(self._handle.read())
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        # Opzioni di serializzazione (indent, ecc.) le capisce solo il json standard
+        if orjson is None or self.kwargs:
+            return super().write(data)
+
+        self._handle.seek(0)
+        serialized = orjson.dumps(data)
+        if "b" not in self._mode:
+            serialized = serialized.decode("utf-8")
+
+        try:
+            self._handle.write(serialized)
+        except io.UnsupportedOperation:
+            raise IOError(f'Cannot write to the database. Access mode is "{self._mode}"')
+
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        # Il file può essersi accorciato
+        self._handle.truncate()
@@ -0,0 +1,77 @@
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable
+
+from textual.suggester import Suggester
+
+
+@lru_cache(maxsize=8)
+def _build_index(suggestions: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Costruisce l'indice ordinato (forme normalizzate, forme originali).
+    Condiviso tra le istanze: riaprire il form con gli stessi autori/tag non rifà l'ordinamento.
+    """
+    pairs = sorted((suggestion.casefold(), suggestion) for suggestion in suggestions)
+    return tuple(folded for folded, _ in pairs), tuple(original for _, original in pairs)
+
+
+class PrefixSuggester(Suggester):
+    """
+    Suggeritore per prefisso, equivalente a SuggestFromList(case_sensitive=False)
+    ma con ricerca binaria: invece di scorrere tutta la lista ad ogni tasto,
+    trova il primo elemento compatibile in O(log N).
+    """
+
+    def __init__(self, suggestions: Iterable[str]) -> None:
+        super().__init__(case_sensitive=False)
+        # Forme normalizzate e originali, ordinate per la bisezione
+        self._folded, self._suggestions = _build_index(tuple(suggestions))
+
+    async def get_suggestion(self, value: str) -> str | None:
+        """
+        Restituisce il primo suggerimento che inizia con il valore digitato.
+
+        Args:
+            value: Il valore corrente (già normalizzato con casefold dalla classe base).
+
+        Returns:
+            Il suggerimento nella sua forma originale, oppure None.
+        """
+        return self._lookup(value)
+
+    def _lookup(self, folded_prefix: str) -> str | None:
+        """Ricerca binaria del primo elemento che inizia con il prefisso normalizzato."""
+        index = bisect_left(self._folded, folded_prefix)
+        if index < len(self._folded) and self._folded[index].startswith(folded_prefix):
+            return self._suggestions[index]
+        return None
+
+
+class TagSuggester(PrefixSuggester):
+    """
+    Suggeritore per un elenco di tag separati da virgola: completa solo
+    l'ultimo tag, lasciando intatto (maiuscole comprese) quanto già scritto.
+    """
+
+    def __init__(self, suggestions: Iterable[str]) -> None:
+        super().__init__(suggestions)
+        # Riceviamo il valore grezzo: normalizziamo noi solo l'ultimo tag
+        self.case_sensitive = True
+
+    async def get_suggestion(self, value: str) -> str | None:
+        """
+        Completa l'ultimo tag dell'elenco.
+
+        Args:
+            value: Il valore corrente, es. "Teologia, Mo".
+
+        Returns:
+            Il valore con l'ultimo tag completato (es. "Teologia, Morale"), oppure None.
+        """
+        current = value[value.rfind(",") + 1:].lstrip()
+        if not current:
+            return None
+        tag = self._lookup(current.casefold())
+        if tag is None:
+            return None
+        return f"{value[:len(value) - len(current)]}{tag}"
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 """ TEXTUAL LIBRARY """
@@ -6,14 +7,20 @@ from textual.widgets import Button, Input, Label
 from textual.containers import Vertical, Grid
 from textual.reactive import reactive
 from textual.message import Message
-from textual.suggester import SuggestFromList
 from textual.css.query import NoMatches
 
 """ MY LIBRARY """
 from tool.config_reader import ConfigReader
+from tool.prefix_suggester import PrefixSuggester, TagSuggester
 from widgets.filtered_directory_tree import FilteredDirectoryTree, FilteredTreePanel
 
 
+@lru_cache(maxsize=8)
+def _sorted_unique(items: tuple[str, ...]) -> tuple[str, ...]:
+    """Ordina ed elimina i duplicati una sola volta per ogni elenco distinto."""
+    return tuple(sorted(set(items)))
+
+
 class AddNewBook(Vertical):
 
     class SaveFileRequest(Message):
@@ -22,8 +29,8 @@ class AddNewBook(Vertical):
             self.book_data = book_data
             super().__init__()
 
-    _authors: list[str] = []
-    _tags: list[str] = []
+    _authors: tuple[str, ...] = ()
+    _tags: tuple[str, ...] = ()
 
     book_data: reactive[Optional[Dict[str, Any]]] = reactive(None)
 
@@ -33,47 +40,64 @@ class AddNewBook(Vertical):
         self._config = ConfigReader()
         self._new_file_path = None
 
+        # Riferimenti ai widget del form, creati in compose
+        self._author_input: Input | None = None
+        self._title_input: Input | None = None
+        self._tags_input: Input | None = None
+        self._save_button: Button | None = None
+        self._save_enabled = False # Stato attuale del pulsante di salvataggio (parte disabilitato)
+
         self.tree_panel = FilteredTreePanel(
             label_text="Seleziona un file:",
-            tree_path=str(ConfigReader.MAIN_UPLOAD_DIR),
+            tree_path=ConfigReader.MAIN_UPLOAD_DIR_PATH,
             id="add-newbook-tree")
 
     @property
-    def authors(self) -> list[str]:
+    def authors(self) -> tuple[str, ...]:
         return self._authors
 
     @authors.setter
     def authors(self, new_authors: list[str]) -> None:
-        self._authors = new_authors
+        authors = _sorted_unique(tuple(new_authors or ()))
+        if authors is self._authors:
+            return # Stesso elenco: il suggeritore è già aggiornato
+        self._authors = authors
+        self._apply_authors_suggester()
+
+    def _apply_authors_suggester(self) -> None:
         # Aggiorna il suggeritore quando la lista cambia
-        try:
-            author_input = self.query_one("#author", Input)
-            if self._authors:
-                author_input.suggester = SuggestFromList(self._authors, case_sensitive=False)
-            else:
-                author_input.suggester = None # Nessun suggeritore se la lista è vuota
-        except NoMatches:
-            # Il widget potrebbe non essere ancora montato, va bene
-            pass
+        author_input = self._author_input
+        if author_input is None:
+            # Il widget potrebbe non essere ancora montato, va bene: lo applica on_mount
+            return
+        if self._authors:
+            author_input.suggester = PrefixSuggester(self._authors)
+        else:
+            author_input.suggester = None # Nessun suggeritore se la lista è vuota
 
 
     # !! AGGIUNGI PROPERTY SETTER PER TAGS !!
     @property
-    def tags(self) -> list[str]:
+    def tags(self) -> tuple[str, ...]:
         return self._tags
 
     @tags.setter
     def tags(self, new_tags: list[str]) -> None:
-        self._tags = new_tags
+        tags = _sorted_unique(tuple(new_tags or ()))
+        if tags is self._tags:
+            return
+        self._tags = tags
+        self._apply_tags_suggester()
+
+    def _apply_tags_suggester(self) -> None:
         # Aggiorna il suggeritore quando la lista cambia
-        try:
-            tags_input = self.query_one("#tags", Input)
-            if self._tags:
-                tags_input.suggester = SuggestFromList(self._tags, case_sensitive=False)
-            else:
-                tags_input.suggester = None
-        except NoMatches:
-            pass
+        tags_input = self._tags_input
+        if tags_input is None:
+            return
+        if self._tags:
+            tags_input.suggester = TagSuggester(self._tags)
+        else:
+            tags_input.suggester = None
 
     def compose(self) -> ComposeResult:
 
@@ -81,31 +105,45 @@ class AddNewBook(Vertical):
         with Grid(id="grid_container"):
             yield Label("Autore:", classes="center-label")
             # yield Input(placeholder="Author...", suggester=SuggestFromList(self.authors, case_sensitive=False), id="author")
-            yield Input(placeholder="Author...", id="author")
+            self._author_input = Input(placeholder="Author...", id="author")
+            yield self._author_input
             yield Label("Titolo:", classes="center-label")
-            yield Input(id="title", placeholder="Titolo...")
+            self._title_input = Input(id="title", placeholder="Titolo...")
+            yield self._title_input
             yield Label("Tags:", classes="center-label")
-            yield Input(placeholder="Tags...", id="tags")
+            self._tags_input = Input(placeholder="Tags...", id="tags")
+            yield self._tags_input
             # yield Input(placeholder="Tags (comma-separated)", suggester=SuggestFromList(self.tags, case_sensitive=False), id="tags")
             yield Button("❌ Annulla",
                                 id="btn_cancel",
                                 variant="error",
                                 disabled=False)
-            yield Button("➕ Aggiungi",
+            self._save_button = Button("➕ Aggiungi",
                                 id="btn_save",
                                 variant="success",
                                 disabled=True)
+            yield self._save_button
+
+
+    def _recompute_save_enabled(self) -> None:
+        """Abilita il salvataggio solo con autore, titolo e file; tocca il pulsante solo se lo stato cambia."""
+        enabled = bool(self._new_file_path is not None
+                       and self._author_input.value.strip()
+                       and self._title_input.value.strip())
+        if enabled != self._save_enabled:
+            self._save_button.disabled = not enabled
+            self._save_enabled = enabled
+
+
+    def on_mount(self) -> None:
+        # Elenchi assegnati prima che il form esistesse
+        self._apply_authors_suggester()
+        self._apply_tags_suggester()
 
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle input changes to enable/disable the save button."""
-        author = self.query_one("#author", Input).value.strip()
-        title = self.query_one("#title", Input).value.strip()
-
-        if author and title and self._new_file_path is not None:
-            self.query_one("#btn_save", Button).disabled = False
-        else:
-            self.query_one("#btn_save", Button).disabled = True
+        self._recompute_save_enabled()
 
 
     def on_directory_tree_file_selected(self, event: FilteredDirectoryTree.FileSelected) -> None:
@@ -118,27 +156,22 @@ class AddNewBook(Vertical):
             }
 
             self.notify(f"Selected file: {event.path.name}", severity="info")
-
-            author = self.query_one("#author", Input).value.strip()
-            title = self.query_one("#title", Input).value.strip()
-
-            if author and title:
-                self.query_one("#btn_save", Button).disabled = False
-            else:
-                self.query_one("#btn_save", Button).disabled = True
-
         else:
             self._new_file_path = None
-            self.query_one("#btn_save", Button).disabled = True
+
+        self._recompute_save_enabled()
 
 
     def _clear_inputs(self) -> None:
         """Pulisce i campi di input e resetta lo stato."""
         try:
-            self.query_one("#author", Input).value = ""
-            self.query_one("#title", Input).value = ""
-            self.query_one("#tags", Input).value = ""
-            self.query_one("#btn_save", Button).disabled = True
+            # Un solo aggiornamento a schermo e nessun Input.Changed per ogni campo svuotato
+            with self.app.batch_update(), self.prevent(Input.Changed):
+                self._author_input.value = ""
+                self._title_input.value = ""
+                self._tags_input.value = ""
+                self._save_button.disabled = True
+                self._save_enabled = False
             # Potrebbe essere necessario resettare anche la selezione dell'albero
             self.tree_panel.clear_selection() # Assumendo che esista un metodo del genere
             self._new_file_path = None
@@ -157,9 +190,9 @@ class AddNewBook(Vertical):
         if not hasattr(self, '_new_file_path') and not isinstance(self._new_file_path, dict) and not self._new_file_path:
             return
 
-        author = self.query_one("#author", Input).value.strip()
-        title = self.query_one("#title", Input).value.strip()
-        tags = self.query_one("#tags", Input).value.split(",")
+        author = self._author_input.value.strip()
+        title = self._title_input.value.strip()
+        tags = [tag.strip() for tag in self._tags_input.value.split(",") if tag.strip()]
 
         if not author:
             self.notify("Author is required!", severity="error")
@@ -1,4 +1,3 @@
-from pathlib import Path
 from typing import Optional, Dict, Any
 from tinydb import Query
 
@@ -17,6 +16,10 @@ from tool.config_reader import ConfigReader
 from tool.formatted_date_time import FormattedDateTime
 
 
+# Valore "vuoto" dei campi non testuali, per confrontare il form con il libro salvato
+_EMPTY_FIELD = {"tags": []}
+
+
 class BookDetails(Vertical):
     class OpenFileRequest(Message):
         """Evento personalizzato per richiesta apertura file"""
@@ -30,6 +33,17 @@ class BookDetails(Vertical):
         super().__init__(id=id)
         self._db = db
         self._widgets_ready = False
+        # Riferimenti ai widget, presi una volta in on_mount
+        self._w_title: Input | None = None
+        self._w_author: Input | None = None
+        self._w_tags: Input | None = None
+        self._w_added: Input | None = None
+        self._w_description: TextArea | None = None
+        self._w_read: Checkbox | None = None
+        self._w_open: Button | None = None
+        self._w_save: Button | None = None
+        self._w_container: Grid | None = None
+        self._w_placeholder: Static | None = None
 
     def compose(self) -> ComposeResult:
         with Grid(id="grid_container", classes="hidden"):
@@ -58,6 +72,17 @@ class BookDetails(Vertical):
 
     def on_mount(self) -> None:
         """Called when the widget is mounted."""
+        # Una sola ricerca nel DOM per widget: gli aggiornamenti usano i riferimenti
+        self._w_title = self.query_one("#title", Input)
+        self._w_author = self.query_one("#author", Input)
+        self._w_tags = self.query_one("#tags", Input)
+        self._w_added = self.query_one("#added", Input)
+        self._w_description = self.query_one("#description", TextArea)
+        self._w_read = self.query_one("#read", Checkbox)
+        self._w_open = self.query_one("#btn_open_file", Button)
+        self._w_save = self.query_one("#btn_save", Button)
+        self._w_container = self.query_one("#grid_container", Grid)
+        self._w_placeholder = self.query_one("#details_placeholder", Static)
         self._widgets_ready = True
 
         self._update_ui_from_book_data()
@@ -71,8 +96,8 @@ class BookDetails(Vertical):
 
 
     def _update_ui_from_book_data(self) -> None:
-        container = self.query_one("#grid_container")
-        placeholder = self.query_one("#details_placeholder")
+        container = self._w_container
+        placeholder = self._w_placeholder
         book_data = self.book_data # Get the current data
 
         if not book_data:
@@ -81,11 +106,8 @@ class BookDetails(Vertical):
             placeholder.remove_class("hidden")
             placeholder.update("⏳ Seleziona un libro per visualizzare i dettagli")
             # Disable buttons if no data
-            try:
-                self.query_one("#btn_open_file", Button).disabled = True
-                self.query_one("#btn_save", Button).disabled = True
-            except NoMatches:
-                self.log.warning("Buttons not found when trying to disable them.")
+            self._w_open.disabled = True
+            self._w_save.disabled = True
             return
 
         self.log(f"Updating UI with data for book UUID: {book_data.get('uuid', 'N/A')}")
@@ -94,9 +116,9 @@ class BookDetails(Vertical):
 
         try:
             # --- Update Input Fields ---
-            self.query_one("#title", Input).value = book_data.get("title", "")
-            self.query_one("#author", Input).value = book_data.get("author", "")
-            self.query_one("#tags", Input).value = ", ".join(book_data.get("tags", []))
+            self._w_title.value = book_data.get("title", "")
+            self._w_author.value = book_data.get("author", "")
+            self._w_tags.value = ", ".join(book_data.get("tags", []))
 
             # --- Update Added Date (Formatted) ---
             added_formatted = "N/A"
@@ -107,27 +129,27 @@ class BookDetails(Vertical):
                 except (ValueError, TypeError):
                     self.log.warning(f"Invalid date format: {added_raw}")
                     added_formatted = "Data Invalida"
-            self.query_one("#added", Input).value = added_formatted
+            self._w_added.value = added_formatted
 
             # --- Update TextArea ---
             # Use load_text for potentially large content or multi-line initialization
             description_value = book_data.get("description") # Prendi il valore (può essere None)
             description_text = description_value if description_value is not None else ""
-            self.query_one("#description", TextArea).load_text(description_text)
+            self._w_description.load_text(description_text)
 
             # --- Update Checkbox ---
             # Ensure the value from DB is treated as boolean
             read_value = book_data.get("read", "") # Default to False if missing
 
             if not read_value == "":
-                self.query_one("#read", Checkbox).value = True
+                self._w_read.value = True
 
             # --- Enable Buttons ---
             # Enable 'Open File' only if there's a filename
             has_filename = bool(book_data.get("filename"))
-            self.query_one("#btn_open_file", Button).disabled = not has_filename
+            self._w_open.disabled = not has_filename
             # Always enable 'Save' when data is loaded (or decide based on changes later)
-            self.query_one("#btn_save", Button).disabled = False # Enable save button
+            self._w_save.disabled = False # Enable save button
 
             self.log("UI update complete.")
 
@@ -162,16 +184,19 @@ class BookDetails(Vertical):
             return
 
         uuid = self.book_data.get("uuid")
-        title = self.query_one("#detail_title", Input).value
-        author = self.query_one("#detail_author", Input).value
-        keywords_str = ", ".join(self.query_one("#detail_tags", Input).value)
-        description = self.query_one("#detail_description", TextArea).value
+        title = self._w_title.value
+        author = self._w_author.value
+        # Lista di tag puliti, come nel resto del DB (niente tag vuoti)
+        tags = [tag.strip() for tag in self._w_tags.value.split(",") if tag.strip()]
+        description = self._w_description.text
 
         read = ""
-        if self.query_one("#detail_read", Checkbox).value:
-            read = FormattedDateTime.now()
+        if self._w_read.value:
+            # Se il libro era già segnato come letto conserva la data originale
+            read = self.book_data.get("read") or FormattedDateTime.now()
 
-        filename = self.query_one("#detail_added", Input).value
+        # Il file non si modifica da qui: conserva quello del libro
+        filename = self.book_data.get("filename")
 
         self.log("Save button pressed. Gathering data from UI.")
         try:
@@ -179,7 +204,7 @@ class BookDetails(Vertical):
                 "uuid": uuid,
                 "title": title,
                 "author": author,
-                "tags": keywords_str,
+                "tags": tags,
                 "description": description,
                 "read": read,
                 "filename": filename
@@ -193,16 +218,28 @@ class BookDetails(Vertical):
                 self.notify("❌ L'autore non può essere vuoto.", severity="error")
                 return
 
+            # Solo i campi davvero modificati: niente scrittura se non è cambiato nulla
+            # Un campo mancante o null nel DB vale quanto il valore vuoto mostrato nel form
+            # (es. description None caricata come ""): non è una modifica
+            changes = {
+                key: value for key, value in updated_data.items()
+                if (self.book_data.get(key) or _EMPTY_FIELD.get(key, "")) != (value or _EMPTY_FIELD.get(key, ""))
+            }
+            if not changes:
+                self.notify("Nessuna modifica da salvare.", title="Salvataggio")
+                return
+
             # --- Database Update ---
             Record = Query()
 
-            updated_count = self._db.update(updated_data, Record.uuid == updated_data["uuid"])
+            updated_count = self._db.update(changes, Record.uuid == uuid)
+            self._db.storage.flush()
 
             if updated_count:
                  self.log(f"Successfully updated book UUID: {updated_data['uuid']} in DB.")
                  self.notify("✅ Modifiche salvate con successo!", title="Salvataggio")
                  # Update the internal book_data to reflect changes immediately
-                 self.book_data = updated_data
+                 self.book_data = {**self.book_data, **changes}
                  # Optionally: Notify the main app to refresh the table row if needed
                  # (though the cache in BookManagerApp won't be updated until next refresh)
             else:
@@ -212,7 +249,7 @@ class BookDetails(Vertical):
 
             # --- Exiftool Update (Keep your original logic if needed) ---
             # Be careful with file paths and error handling here
-            author_path = Path(f"{ConfigReader.LIBRARY}/{updated_data['author']}") # Use config
+            author_path = ConfigReader.LIBRARY_PATH / updated_data['author'] # Use config
             author_path.mkdir(parents=True, exist_ok=True)
             file_path = author_path / updated_data['filename']
 
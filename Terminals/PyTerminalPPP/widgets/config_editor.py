@@ -1,4 +1,5 @@
-import yaml
+import json
+import os
 from pathlib import Path
 
 from textual.widgets import Input, Button, Label
@@ -6,41 +7,80 @@ from textual.containers import Vertical, Horizontal, Grid
 from textual.widget import Widget
 from textual.message import Message
 
-from tool.config_reader import ConfigReader
+from tool.config_reader import ConfigReader, _json_loads # Stesso parser JSON (orjson se installato)
+
+
+# Chiave nella sezione "paths" del file -> attributo di ConfigReader
+_ATTR_MAP = {
+    "db": "DB",
+    "library": "LIBRARY",
+    "main_upload_dir": "MAIN_UPLOAD_DIR",
+    "exiftool_path": "EXIFTOOL_PATH",
+}
 
 
 class ConfigEditor(Vertical):
+    _SAVE_LABEL = "💾 Salva"
+
     class SaveRequested(Message):
         def __init__(self, sender: Widget, new_config: dict) -> None:
-            super().__init__(sender)
+            super().__init__()
             self.new_config = new_config
 
 
     def __init__(self, id=None):
         super().__init__(id=id)
         self._config = ConfigReader()
+        self._config_path = Path(ConfigReader.CONFIGPATH)
+        # Input dei percorsi per chiave di configurazione, creati in compose
+        self._fields: dict[str, Input] = {}
+        # Contenuto del file di configurazione già letto, valido finché non cambia la mtime
+        self._existing_cfg: dict | None = None
+        self._existing_mtime = -1
+        # Percorsi mostrati al montaggio (o dopo l'ultimo salvataggio) e ultimo testo scritto su disco
+        self._original_paths: dict[str, str] = {}
+        self._last_written: str | None = None
+        self._save_button: Button | None = None # Creato in compose
 
 
     def compose(self):
         with Grid(id="grid_container"):
             yield Label("Database: ")
-            yield Input(id="config_db", placeholder="DB Path...")
+            self._fields["db"] = Input(id="config_db", placeholder="DB Path...")
+            yield self._fields["db"]
             yield Label("Library: ")
-            yield Input(id="config_library", placeholder="Library Path...")
+            self._fields["library"] = Input(id="config_library", placeholder="Library Path...")
+            yield self._fields["library"]
             yield Label("Upload directory: ")
-            yield Input(id="upload_dir", placeholder="Upload default directory...")
+            self._fields["main_upload_dir"] = Input(id="upload_dir", placeholder="Upload default directory...")
+            yield self._fields["main_upload_dir"]
             yield Label("ExIfTool: ")
-            yield Input(id="exiftool_path", placeholder="ExIfTool exe...")
+            self._fields["exiftool_path"] = Input(id="exiftool_path", placeholder="ExIfTool exe...")
+            yield self._fields["exiftool_path"]
+            self._save_button = Button(self._SAVE_LABEL, id="save_config", variant="success")
+            yield self._save_button
 
 
     def on_mount(self):
-        self.query_one("#config_db", Input).value = self._config.DB
-        self.query_one("#config_library", Input).value = self._config.LIBRARY
-        self.query_one("#upload_dir", Input).value = self._config.MAIN_UPLOAD_DIR
-        self.query_one("#exiftool_path", Input).value = self._config.EXIFTOOL_PATH
+        for key, widget in self._fields.items():
+            widget.value = getattr(self._config, _ATTR_MAP[key])
+        self._original_paths = {key: widget.value for key, widget in self._fields.items()}
 
 
-    async def on_button_pressed(self, event: Button.Pressed):
+    def _load_existing(self) -> dict:
+        """Legge il file di configurazione solo se è cambiato dall'ultima lettura."""
+        try:
+            mtime = self._config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if self._existing_cfg is None or mtime != self._existing_mtime:
+            with open(self._config_path, 'rb') as f:
+                self._existing_cfg = _json_loads(f.read()) or {}
+            self._existing_mtime = mtime
+        return self._existing_cfg
+
+
+    def on_button_pressed(self, event: Button.Pressed):
         if event.button.id != "save_config":
             return
 
@@ -50,32 +90,48 @@ class ConfigEditor(Vertical):
         for key, widget in self._fields.items():
             new_config["paths"][key] = widget.value
 
+        if new_config["paths"] == self._original_paths:
+            # Nessun percorso modificato: niente lettura né scrittura del file
+            self.post_message(self.SaveRequested(self, new_config))
+            self.notify("Nessuna modifica alla configurazione.", severity="information")
+            return
+
         # Mantieni le sezioni esistenti (tags, tag_icons, ecc.)
-        if self._config_path.exists():
-            try:
-                with open(self._config_path, 'r', encoding='utf-8') as f:
-                    existing_config = yaml.safe_load(f) or {}
-                    if 'tags' in existing_config:
-                        new_config['tags'] = existing_config['tags']
-                    if 'tag_icons' in existing_config:
-                        new_config['tag_icons'] = existing_config['tag_icons']
-            except Exception as e:
-                self.notify(f"Errore nel leggere il file YAML esistente: {e}", severity="error")
-
-        # Salva i nuovi dati nel file YAML
         try:
-            with open(self._config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(new_config, f, allow_unicode=True, sort_keys=False)
+            existing_config = self._load_existing()
+            if 'tags' in existing_config:
+                new_config['tags'] = existing_config['tags']
+            if 'tag_icons' in existing_config:
+                new_config['tag_icons'] = existing_config['tag_icons']
+        except Exception as e:
+            self.notify(f"Errore nel leggere il file di configurazione esistente: {e}", severity="error")
+
+        # Salva i nuovi dati nel file di configurazione
+        try:
+            # Il file è config.json, letto da ConfigReader come JSON: si scrive JSON (in un'unica write)
+            serialized = json.dumps(new_config, ensure_ascii=False, indent=2)
+            # Contenuto identico a quello già su disco: il file non si tocca
+            if serialized != self._last_written or self._config_path.stat().st_mtime_ns != self._existing_mtime:
+                # File temporaneo + os.replace: il rename è atomico, niente file troncato a metà
+                tmp_path = self._config_path.with_name(self._config_path.name + ".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(serialized)
+                os.replace(tmp_path, self._config_path)
+                self._last_written = serialized
+                # Quello appena scritto è il nuovo contenuto del file: niente rilettura al prossimo salvataggio
+                self._existing_cfg = new_config
+                self._existing_mtime = self._config_path.stat().st_mtime_ns
+            self._original_paths = dict(new_config["paths"])
             self.post_message(self.SaveRequested(self, new_config))
             self.notify("Configurazione salvata con successo!", severity="information")
         except Exception as e:
-            self.notify(f"Errore nel salvataggio del file YAML: {e}", severity="error")
-
-        # Animazione del pulsante di salvataggio
-        save_button = self.query_one("#save_config", Button)
-        original_label = save_button.label
-        save_button.label = "✅ Configurazione salvata!"
-        save_button.refresh()
-        await self.sleep(1)
-        save_button.label = original_label
-        save_button.refresh()
+            self.notify(f"Errore nel salvataggio del file di configurazione: {e}", severity="error")
+
+        # Animazione del pulsante di salvataggio: l'etichetta torna com'era dopo un secondo,
+        # senza tenere occupato il gestore dell'evento
+        self._save_button.label = "✅ Configurazione salvata!"
+        self.set_timer(1.0, self._restore_save_label)
+
+
+    def _restore_save_label(self) -> None:
+        self._save_button.label = self._SAVE_LABEL
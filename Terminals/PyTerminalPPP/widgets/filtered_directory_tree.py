@@ -1,38 +1,77 @@
+import os
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Container
 from textual.widgets import DirectoryTree, Label, Button
-
+from textual.worker import Worker
+
+
+class _ScannedPath(type(Path())):
+    """
+    Path ottenuto da os.scandir: is_dir/is_file riusano i dati della DirEntry
+    invece di fare una nuova stat per ogni voce.
+    """
+
+    @classmethod
+    def from_entry(cls, entry: os.DirEntry) -> "_ScannedPath":
+        path = cls(entry.path)
+        path._entry = entry
+        return path
+
+    def is_dir(self) -> bool:
+        entry = getattr(self, "_entry", None)
+        if entry is None:
+            return super().is_dir()
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
+
+    def is_file(self) -> bool:
+        entry = getattr(self, "_entry", None)
+        if entry is None:
+            return super().is_file()
+        try:
+            return entry.is_file()
+        except OSError:
+            return False
 
 
 class FilteredDirectoryTree(DirectoryTree):
 
-    ALLOWED_EXTENSIONS = {".pdf", ".docx", ".epub"}
-
-    def __init__(
-        self,
-        path: str | Path,
-        *,
-        name: str | None = None,
-        id: str | None = None,
-        classes: str | None = None,
-        disabled: bool = False,
-    ) -> None:
-        super().__init__(path, name=name, id=id, classes=classes, disabled=disabled)
-
-        self.allowed_extensions = {ext.lower() for ext in (self.ALLOWED_EXTENSIONS or set())}
+    # Estensioni già in minuscolo, uguali per ogni albero
+    ALLOWED_EXTENSIONS = frozenset({".pdf", ".docx", ".epub"})
+    # Le stesse estensioni in una tupla, per un solo str.endswith per nome
+    _EXT_TUPLE = tuple(ALLOWED_EXTENSIONS)
+
+    def _directory_content(self, location: Path, worker: Worker) -> Iterator[Path]:
+        """Come DirectoryTree._directory_content, ma con os.scandir: il tipo di ogni voce è già noto."""
+        try:
+            with os.scandir(location) as entries:
+                for entry in entries:
+                    if worker.is_cancelled:
+                        break
+                    yield _ScannedPath.from_entry(entry)
+        except PermissionError:
+            pass
 
     def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
+        if not self.ALLOWED_EXTENSIONS:
+            # Nessun filtro sulle estensioni: il test si fa una volta sola, fuori dal ciclo
+            yield from (path for path in paths if path.is_dir() or path.is_file())
+            return
+
+        exts = self._EXT_TUPLE
         for path in paths:
             if path.is_dir():
                 yield path
-            elif path.is_file():
-                if self.allowed_extensions and path.suffix.lower() in self.allowed_extensions:
-                    yield path
-                elif not self.allowed_extensions:
-                     yield path
+                continue
+            # Estensione controllata sul nome, senza passare da PurePath.suffix;
+            # is_file solo per i nomi che passano il filtro
+            if path.name.lower().endswith(exts) and path.is_file():
+                yield path
 
 
 
@@ -51,19 +90,31 @@ class FilteredTreePanel(Container):
 
         self.label_text = label_text
         self.tree_path = tree_path
+        self._tree: FilteredDirectoryTree | None = None # Creato in compose
+        self._refresh_pending = False
 
 
     def compose(self) -> ComposeResult:
         """Crea e dispone i widget interni."""
         with Horizontal(id="filtered_dir_tree_container"):
             yield Label(self.label_text, id="center-label")
-            yield FilteredDirectoryTree(
+            self._tree = FilteredDirectoryTree(
                     path=self.tree_path,
                     id="filtered_directory_tree")
+            yield self._tree
 
             yield Button("🔄 Refresh", id="filtered_btn_refresh", variant="primary", disabled=False)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         # Assicuriamoci che sia il nostro bottone (se ce ne fossero altri)
         if event.button.id == "filtered_btn_refresh":
-            self.query_one("#filtered_directory_tree", FilteredDirectoryTree).refresh()
\ No newline at end of file
+            # Più click ravvicinati producono una sola rilettura della cartella
+            if self._refresh_pending:
+                return
+            self._refresh_pending = True
+            self.set_timer(0.25, self._do_refresh)
+
+    def _do_refresh(self) -> None:
+        self._refresh_pending = False
+        # reload rilegge il contenuto da disco (refresh ridisegnerebbe soltanto)
+        self._tree.reload()
\ No newline at end of file
@@ -40,14 +40,14 @@ db = TinyDB('test_library.json')  # Sostituisci con il percorso del tuo database
 tags_table = db.table('tags')
 
 # Inserimento dei tag
+Tag = Query()
 for name, icon in tags_data.items():
-    # Verifica se il tag esiste già
-    Tag = Query()
+    # Verifica se il tag esiste già (una sola ricerca per tag)
     existing_tag = tags_table.get(Tag.name == name)
     
     if existing_tag:
-        # Aggiorna il tag esistente
-        tags_table.update({'icon': icon}, Tag.name == name)
+        # Aggiorna il tag esistente riusando il doc_id appena trovato
+        tags_table.update({'icon': icon}, doc_ids=[existing_tag.doc_id])
         print(f"Tag '{name}' aggiornato con icona '{icon}'")
     else:
         # Inserisce un nuovo tag
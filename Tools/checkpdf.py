@@ -91,7 +91,9 @@ def check_and_report_missing_files():
     # 2. Apri il database TinyDB (invariato)
     try:
         db = TinyDB(db_path, encoding='utf-8')
-        print(f"Database aperto. Numero record totali: {len(db)}.")
+        # Unica lettura del file: len(db) rileggerebbe tutto il JSON prima di db.all()
+        all_books = db.all()
+        print(f"Database aperto. Numero record totali: {len(all_books)}.")
     except Exception as e:
         print(f"{COLOR_ERROR}Errore nell'aprire il database '{db_path}': {e}")
         sys.exit(1)
@@ -100,7 +102,6 @@ def check_and_report_missing_files():
     missing_filename_list = []
     file_not_found_list = []
     processed_count = 0
-    all_books = db.all()
     total_records = len(all_books)
     print(f"Inizio controllo di {total_records} record...")
 